@@ -0,0 +1,2 @@
+# Инструменты рендера проекта: запуск сцен, кэш фрагментов, отчеты.
+# Запуск из корня репозитория: python -m pipeline.<модуль> ...
@@ -0,0 +1,116 @@
+import argparse
+import itertools
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pipeline.cache import FragmentIndex
+from pipeline.render import QUALITIES, load_scene_class, render_scene, variant_label
+
+# --- ПАКЕТНЫЙ РЕНДЕР ВАРИАНТОВ ОДНОЙ СЦЕНЫ ---
+# Один шаблон сцены и много наборов параметров (все буквы, любые имена):
+# python -m pipeline.batch scenes/Transform.py MorphScene -p letter=A,B,C
+# Варианты идут подряд в долгоживущих процессах: import manim, модули сцен,
+# шрифты Pango, PyAV и открытое хранилище глифов поднимаются один раз на
+# процесс, а не на каждую букву. -j N - N таких процессов, каждый берет
+# варианты по очереди (процессы пула не пересоздаются).
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+# -p key=v1,v2 -p other=x,y -> декартово произведение наборов
+def expand_params(pairs):
+    keys, choices = [], []
+    for pair in pairs:
+        key, sep, values = pair.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Expected key=value[,value...], got {pair!r}")
+        keys.append(key)
+        choices.append([parse_value(value) for value in values.split(",")])
+    return [dict(zip(keys, combo)) for combo in itertools.product(*choices)]
+
+def _warm_worker(path, scene_name):
+    # Импорт manim и модуля сцены - один раз на процесс пула
+    load_scene_class(path, scene_name)
+
+def _render_variant(path, scene_name, params, quality, media_dir, stream):
+    output_file = f"{scene_name}_{variant_label(params)}"
+    started = time.perf_counter()
+    try:
+        if stream:
+            from pipeline.stream import stream_scene
+
+            stream_scene(path, scene_name, quality, media_dir, params=params, output_file=output_file)
+            report = {}
+        else:
+            report = render_scene(
+                path, scene_name, quality, options={"output_file": output_file},
+                media_dir=media_dir, record=False, params=params,
+            )
+        status, error = "ok", None
+    except Exception:
+        report, status, error = {}, "failed", traceback.format_exc()
+    report.update(
+        params=params, output=output_file, status=status, error=error,
+        seconds=time.perf_counter() - started,
+    )
+    return report
+
+def render_batch(path, scene_name, variants, quality="l", workers=1, media_dir="media", stream=False):
+    index = FragmentIndex(media_dir)
+    results = []
+
+    def collect(result):
+        if result["status"] == "ok" and result.get("partial_dir"):
+            stats = index.record(result["partial_dir"], result["fragments"], result["started"])
+            result.update(hits=stats["hits"], misses=stats["misses"])
+        print(f"[{result['status']:>6}] {result['output']} {result['seconds']:.1f}s")
+        results.append(result)
+
+    args = (str(path), scene_name)
+    if workers <= 1:
+        # Все варианты в этом же процессе
+        _warm_worker(*args)
+        for params in variants:
+            collect(_render_variant(*args, params, quality, media_dir, stream))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(variants)) or 1, initializer=_warm_worker, initargs=args) as pool:
+        futures = [pool.submit(_render_variant, *args, params, quality, media_dir, stream) for params in variants]
+        for future in as_completed(futures):
+            collect(future.result())
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.batch", description="Render many parameter sets of one scene in long-lived processes")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-p", "--param", action="append", default=[], help="key=v1,v2,... (repeat for a cartesian product)")
+    parser.add_argument("--params", type=Path, help="JSON file with a list of parameter objects")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default: render in this process)")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--stream", action="store_true", help="one encoder per variant, no partial movie files")
+    args = parser.parse_args(argv)
+
+    variants = expand_params(args.param) if args.param else []
+    if args.params is not None:
+        variants += json.loads(args.params.read_text())
+    if not variants:
+        parser.error("no parameter sets given (use -p or --params)")
+
+    started = time.perf_counter()
+    results = render_batch(args.file, args.scene, variants, args.quality, args.jobs, args.media_dir, args.stream)
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"{len(results)} variants in {time.perf_counter() - started:.1f}s, {len(failed)} failed")
+    for result in failed:
+        print(f"  failed: {result['output']}\n{result['error']}")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import fnmatch
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from pipeline.render import QUALITIES, SCENES_DIR, load_scene_module, render_scene
+from pipeline.runner import discover_scenes
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- БЕНЧМАРК СЦЕН ---
+# Каждая сцена рендерится в отдельном процессе (чистый пиковый RSS) с
+# фиксированным качеством, без записи видео и без кэша фрагментов: кадры
+# рисуются, но не кодируются. Метрики: время, кадры/с, пиковый RSS и стадии
+# профилировщика. Сравнение с сохраненной базой: рост времени или памяти
+# больше порога - регрессия, код возврата 1.
+BASELINE = Path(__file__).resolve().parent.parent / "benchmarks" / "baseline.json"
+NULL_SINK = {"write_to_movie": False, "disable_caching": True}
+# Чем больше, тем хуже; кадры/с выводятся из seconds и не сравниваются отдельно
+COMPARED = ("seconds", "peak_rss_mb")
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдает килобайты, macOS - байты
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+def _bench_scene(path, scene_name, quality, media_dir):
+    profiling = load_scene_module(SCENES_DIR / "profiling.py")
+    profilers = []
+    started = perf_counter()
+    render_scene(
+        path, scene_name, quality, options=NULL_SINK, media_dir=media_dir, record=False,
+        setup=lambda scene: profilers.append(profiling.RenderProfiler(scene)),
+    )
+    seconds = perf_counter() - started
+    profiler = profilers[0].finish()
+    return {
+        "seconds": seconds,
+        "frames": profiler.frames,
+        "fps": profiler.frames / seconds if seconds else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": profiler.stage_totals(),
+    }
+
+# Лучший из repeat прогонов (меньше шума от соседних процессов)
+def bench_scene(path, scene_name, quality="l", media_dir="media", repeat=1):
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            runs.append(pool.submit(_bench_scene, str(path), scene_name, quality, media_dir).result())
+    best = min(runs, key=lambda run: run["seconds"])
+    best["runs"] = [run["seconds"] for run in runs]
+    return best
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in COMPARED:
+            old, new = base.get(metric), result.get(metric)
+            if old and new is not None and (new - old) / old > threshold:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.bench", description="Benchmark every scene against a baseline")
+    parser.add_argument("patterns", nargs="*", help="file.Scene globs (default: all)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--media-dir", default="media")
+    args = parser.parse_args(argv)
+
+    jobs = discover_scenes()
+    if args.patterns:
+        jobs = [job for job in jobs if any(fnmatch.fnmatch(f"{job[0].stem}.{job[1]}", p) for p in args.patterns)]
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    scenes = baseline.get("scenes", {}) if baseline.get("quality") == args.quality else {}
+    results = {}
+    for path, name in jobs:
+        key = f"{path.stem}.{name}"
+        result = bench_scene(path, name, args.quality, args.media_dir, args.repeat)
+        results[key] = result
+        base = scenes.get(key, {}).get("seconds")
+        change = f"{(result['seconds'] - base) / base:+7.1%}" if base else "    new"
+        rss = f"{result['peak_rss_mb']:7.0f} MB" if result["peak_rss_mb"] is not None else ""
+        print(f"{key:<36} {result['seconds']:7.2f}s {change} {result['fps']:7.1f} fps {rss}")
+
+    out = Path(args.media_dir) / "bench" / "latest.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"quality": args.quality, "scenes": results}, indent=1))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        merged = {**scenes, **results}
+        args.baseline.write_text(json.dumps({"quality": args.quality, "scenes": merged}, indent=1))
+        print(f"Baseline saved: {args.baseline}")
+        return
+
+    regressions = compare(results, scenes, args.threshold)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name} {metric}: {old:.2f} -> {new:.2f} ({(new - old) / old:+.1%})")
+    if regressions:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+# --- КЭШ PARTIAL MOVIE ФАЙЛОВ ---
+# Manim кладет фрагменты в media/videos/<модуль>/<качество>/partial_movie_files/<Сцена>/
+# и никогда не удаляет устаревшие хэши. Индекс (media/fragment_index.json)
+# хранит для каждой сцены список фрагментов ее последнего рендера; всё, на что
+# не ссылается ни один последний рендер, можно выселять.
+#
+# LRU по mtime: после рендера всем использованным фрагментам ставим mtime
+# "сейчас". Отсюда же статистика: фрагмент старше начала рендера - попадание,
+# записанный во время рендера - промах.
+INDEX_NAME = "fragment_index.json"
+MOVIE_EXTENSIONS = (".mp4", ".mov", ".webm")
+SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+def parse_size(text):
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*", str(text).upper())
+    if match is None:
+        raise ValueError(f"Bad size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+class FragmentIndex:
+    def __init__(self, media_dir="media"):
+        self.media_dir = Path(media_dir)
+        self.path = self.media_dir / INDEX_NAME
+        self.scenes = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def save(self):
+        self.media_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.scenes, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+
+    # Ключ сцены - ее папка фрагментов относительно media (модуль/качество/сцена)
+    def key_for(self, partial_dir):
+        partial_dir = Path(partial_dir).resolve()
+        try:
+            return partial_dir.relative_to(self.media_dir.resolve()).as_posix()
+        except ValueError:
+            return partial_dir.as_posix()
+
+    def fragment_dir(self, key):
+        path = Path(key)
+        return path if path.is_absolute() else self.media_dir / path
+
+    def referenced(self):
+        files = set()
+        for key, entry in self.scenes.items():
+            folder = self.fragment_dir(key)
+            files.update((folder / name).resolve() for name in entry["fragments"])
+        return files
+
+    # Записать последний рендер сцены. started - time.time() до scene.render()
+    def record(self, partial_dir, fragments, started):
+        now = time.time()
+        names, hits, misses = [], 0, 0
+        for fragment in fragments:
+            if fragment is None:
+                continue
+            path = Path(fragment)
+            if not path.exists():
+                continue
+            if path.stat().st_mtime < started:
+                hits += 1
+            else:
+                misses += 1
+            os.utime(path, (now, now))
+            names.append(path.name)
+
+        stats = {"fragments": names, "hits": hits, "misses": misses, "rendered_at": now}
+        self.scenes[self.key_for(partial_dir)] = stats
+        self.save()
+        return stats
+
+# Все фрагменты под media/videos: [(path, size, mtime)]
+def scan_fragments(media_dir="media"):
+    fragments = []
+    for folder in Path(media_dir).glob("videos/*/*/partial_movie_files/*"):
+        for entry in os.scandir(folder):
+            if entry.is_file() and entry.name.endswith(MOVIE_EXTENSIONS):
+                st = entry.stat()
+                fragments.append((Path(entry.path), st.st_size, st.st_mtime))
+    return fragments
+
+# Выселяем неиспользуемые фрагменты от самых старых, пока кэш не влезет в бюджет.
+# Фрагменты последних рендеров не трогаем, даже если бюджет превышен.
+def collect_garbage(media_dir="media", budget=0, dry_run=False):
+    index = FragmentIndex(media_dir)
+    referenced = index.referenced()
+    fragments = scan_fragments(media_dir)
+    total = sum(size for _, size, _ in fragments)
+
+    evicted, freed = [], 0
+    stale = sorted((f for f in fragments if f[0].resolve() not in referenced), key=lambda f: f[2])
+    for path, size, _ in stale:
+        if total - freed <= budget:
+            break
+        if not dry_run:
+            path.unlink(missing_ok=True)
+        evicted.append(path)
+        freed += size
+
+    return {
+        "files": len(fragments),
+        "referenced": len(referenced),
+        "evicted": evicted,
+        "freed": freed,
+        "size": total - freed,
+    }
+
+def print_stats(media_dir="media"):
+    index = FragmentIndex(media_dir)
+    if not index.scenes:
+        print("No renders recorded yet")
+    for key, entry in sorted(index.scenes.items()):
+        total = entry["hits"] + entry["misses"]
+        rate = entry["hits"] / total if total else 0.0
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["rendered_at"]))
+        print(f"{key}: {entry['hits']} hits / {entry['misses']} misses ({rate:.0%}), {stamp}")
+    fragments = scan_fragments(media_dir)
+    size = sum(size for _, size, _ in fragments)
+    print(f"{len(fragments)} fragments, {format_size(size)} on disk")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.cache", description="Partial movie cache manager")
+    parser.add_argument("--media-dir", default="media")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="hit/miss of the latest render of each scene")
+    gc = commands.add_parser("gc", help="evict fragments no latest render references")
+    gc.add_argument("--budget", default=os.environ.get("RENDER_CACHE_BUDGET"),
+                    help="keep at most this much on disk, e.g. 500MB or 0 (without it gc only reports)")
+    gc.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print_stats(args.media_dir)
+        return
+    # Без явного бюджета только показываем: фрагменты рендеров обычным
+    # manim в индекс не попадают, и gc с нулем снес бы их все
+    if args.budget is None:
+        print("No --budget given, nothing is deleted (pass --budget 0 to evict all stale fragments)")
+        args.dry_run = True
+    result = collect_garbage(args.media_dir, parse_size(args.budget or "0"), args.dry_run)
+    verb = "Would evict" if args.dry_run else "Evicted"
+    print(f"{verb} {len(result['evicted'])} of {result['files']} fragments, "
+          f"{format_size(result['freed'])} freed, {format_size(result['size'])} left")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+from pathlib import Path
+
+from pipeline.render import QUALITIES, SCENES_DIR, load_scene_module, render_scene
+
+# --- ПРОФИЛЬ РЕНДЕРА СЦЕНЫ ---
+# python -m pipeline.profile scenes/alphabet.py LaserWritingScene
+# -> media/profiles/<Сцена>.json (Chrome trace + сводка) и .folded (flamegraph)
+# Кэш фрагментов по умолчанию выключен: иначе закэшированные play не рисуются
+# и профиль показывает только хэширование
+def profile_scene(path, scene_name, quality="l", media_dir="media", options=None):
+    options = {"disable_caching": True, **(options or {})}
+    profiling = load_scene_module(SCENES_DIR / "profiling.py")
+    profilers = []
+
+    def attach(scene):
+        profilers.append(profiling.RenderProfiler(scene))
+
+    render_scene(path, scene_name, quality, options=options, media_dir=media_dir, setup=attach)
+    profiler = profilers[0].finish()
+    return profiler, profiler.write(Path(media_dir) / "profiles")
+
+def print_report(profiler, top=10):
+    total = profiler.root.duration
+    print(f"{profiler.root.name}: {total:.2f}s")
+    for stage, seconds in profiler.stage_totals().items():
+        print(f"  {stage:<12} {seconds:8.2f}s {seconds / total:6.1%}")
+    plays = sorted(profiler.plays_table(), key=lambda row: -row["seconds"])[:top]
+    if plays:
+        print("Slowest plays:")
+    for row in plays:
+        where = " / ".join(row["path"][:-1])
+        print(f"  {row['seconds']:7.2f}s  {row['name']}" + (f"  [{where}]" if where else ""))
+    ledger = getattr(profiler.scene, "ledger", None)
+    if ledger is not None and ledger.costs:
+        print("Updaters:")
+        for row in ledger.table()[:top]:
+            print(f"  {row['seconds']:7.2f}s  {row['ms_per_frame']:6.2f} ms/frame  {row['calls']:6d}x  {row['updater']}")
+        print(f"  frame memo: {ledger.memo_hits} hits / {ledger.memo_misses} misses")
+    reused = getattr(profiler.scene.renderer, "reused_frames", 0)
+    if reused:
+        print(f"Unchanged frames reused: {reused} of {profiler.frames}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.profile", description="Per-stage render profile of a scene")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--cached", action="store_true", help="keep the fragment cache on")
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest plays to list")
+    args = parser.parse_args(argv)
+
+    profiler, report = profile_scene(
+        args.file, args.scene, args.quality, args.media_dir,
+        options={"disable_caching": False} if args.cached else None,
+    )
+    print_report(profiler, args.top)
+    print(f"Report: {report} (+ .folded)")
+
+if __name__ == "__main__":
+    main()
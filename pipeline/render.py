@@ -0,0 +1,112 @@
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from manim import config, logger, tempconfig
+
+from pipeline.cache import FragmentIndex, collect_garbage, format_size, parse_size
+
+# --- РЕНДЕР СЦЕНЫ С УЧЕТОМ КЭША ---
+# То же, что `manim -ql file.py Scene`, но после рендера записываем, какие
+# фрагменты сцена использовала, и при заданном бюджете чистим кэш.
+SCENES_DIR = Path(__file__).resolve().parent.parent / "scenes"
+# Декларативные сцены (scenes/declarative.py): данные вместо модулей
+SPECS_DIR = SCENES_DIR / "specs"
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Модули сцен импортируют соседей (robot_arm, kinematics...) напрямую
+def load_scene_module(path):
+    path = Path(path).resolve()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    if path.stem in sys.modules:
+        return sys.modules[path.stem]
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Класс сцены из модуля или из файла описания (.json/.yaml/.msgpack)
+def load_scene_class(path, scene_name):
+    if Path(path).suffix == ".py":
+        return getattr(load_scene_module(path), scene_name)
+    scene_cls = load_scene_module(SCENES_DIR / "declarative.py").load_scene_spec(path)
+    if scene_cls.__name__ != scene_name:
+        raise ValueError(f"{path} describes {scene_cls.__name__}, not {scene_name}")
+    return scene_cls
+
+def variant_label(params):
+    label = "_".join(str(value) for value in params.values())
+    return re.sub(r"[^\w.-]+", "-", label) or "default"
+
+# Вариант сцены: параметры становятся атрибутами класса-наследника
+# (MorphScene.letter, LaserWritingScene.word...). Имя у класса свое
+# (MorphScene_B): manim называет по нему partial_movie_files/<Scene>, так
+# что у вариантов раздельные фрагменты, записи индекса и списки склейки.
+def scene_variant(scene_cls, params):
+    unknown = [key for key in params if not hasattr(scene_cls, key)]
+    if unknown:
+        raise ValueError(f"{scene_cls.__name__} has no parameter(s): {', '.join(unknown)}")
+    name = f"{scene_cls.__name__}_{variant_label(params)}"
+    return type(name, (scene_cls,), {**params, "__module__": scene_cls.__module__})
+
+# record=False - только вернуть сырые данные рендера (partial_dir, fragments,
+# started); запись в индекс тогда делает вызывающий (например, пул воркеров,
+# чтобы процессы не переписывали индекс друг у друга)
+# setup(scene) вызывается до render() - например, чтобы подключить профилировщик
+# params - атрибуты класса сцены для этого рендера (см. scene_variant)
+def render_scene(path, scene_name, quality="l", options=None, media_dir=None, record=True, setup=None, params=None):
+    scene_cls = load_scene_class(path, scene_name)
+    if params:
+        scene_cls = scene_variant(scene_cls, params)
+    overrides = {"input_file": Path(path), "quality": QUALITIES[quality], **(options or {})}
+    if media_dir is not None:
+        overrides["media_dir"] = str(media_dir)
+
+    with tempconfig(overrides):
+        started = time.time()
+        scene = scene_cls()
+        if setup is not None:
+            setup(scene)
+        scene.render()
+        writer = scene.renderer.file_writer
+        report = {
+            "partial_dir": str(getattr(writer, "partial_movie_directory", None) or ""),
+            "fragments": [str(f) if f is not None else None for f in writer.partial_movie_files],
+            "started": started,
+        }
+        if record and report["partial_dir"]:
+            stats = FragmentIndex(config.media_dir).record(report["partial_dir"], report["fragments"], started)
+            report.update(hits=stats["hits"], misses=stats["misses"])
+            logger.info(f"{scene_name}: {stats['hits']} cached / {stats['misses']} rendered fragments")
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.render", description="Render scenes and track the fragment cache")
+    parser.add_argument("file")
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--budget", default=os.environ.get("RENDER_CACHE_BUDGET"),
+                        help="run cache gc after rendering, e.g. 500MB")
+    args = parser.parse_args(argv)
+
+    for name in args.scenes:
+        render_scene(args.file, name, args.quality, media_dir=args.media_dir)
+    if args.budget is not None:
+        result = collect_garbage(args.media_dir, parse_size(args.budget))
+        print(f"Evicted {len(result['evicted'])} fragments, {format_size(result['freed'])} freed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import ast
+import fnmatch
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pipeline.cache import FragmentIndex, collect_garbage, format_size, parse_size
+from pipeline.render import QUALITIES, SCENES_DIR, SPECS_DIR, load_scene_module, render_scene
+
+# --- ПАРАЛЛЕЛЬНЫЙ РЕНДЕР ВСЕХ СЦЕН ---
+# Сцены ищем по AST (класс с методом construct), не импортируя модули;
+# декларативные сцены из scenes/specs читаются как данные.
+# Каждая сцена рендерится в своем процессе пула; общий media/ дает общий
+# кэш текстов (media/texts) и фрагментов. Индекс фрагментов пишет только
+# родительский процесс.
+SUMMARY_NAME = "render_summary.json"
+
+def discover_scenes(scenes_dir=SCENES_DIR):
+    found = []
+    for path in sorted(Path(scenes_dir).glob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                isinstance(item, ast.FunctionDef) and item.name == "construct" for item in node.body
+            ):
+                found.append((path, node.name))
+    specs = sorted(Path(scenes_dir, SPECS_DIR.name).glob("*.*"))
+    if specs:
+        declarative = load_scene_module(SCENES_DIR / "declarative.py")
+        for path in specs:
+            if path.suffix in declarative.SPEC_SUFFIXES:
+                found.append((path, declarative.read_spec(path).get("scene")))
+    return found
+
+# --- ПРОГРЕВ КЭША ТЕКСТОВ ---
+# Text(...) с литеральными аргументами строим заранее в родителе: SVG
+# попадает в media/texts один раз, и воркеры не пишут один и тот же файл
+# наперегонки; GlyphText заодно заполняет хранилище глифов (media/glyphs).
+# Имена вроде BOLD/ITALIC/GRAY берем из manim; остальные вызовы
+# (PALETTE[...], переменные) просто остаются на воркеров.
+TEXT_CLASSES = ("Text", "MarkupText", "GlyphText")
+
+def _static_value(node, namespace):
+    if isinstance(node, ast.Name) and hasattr(namespace, node.id):
+        return getattr(namespace, node.id)
+    return ast.literal_eval(node)
+
+def literal_text_calls(path, namespace):
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TEXT_CLASSES):
+            continue
+        try:
+            args = [_static_value(arg, namespace) for arg in node.args]
+            kwargs = {kw.arg: _static_value(kw.value, namespace) for kw in node.keywords if kw.arg}
+        except ValueError:
+            continue
+        yield node.func.id, args, kwargs
+
+def warm_text_cache(jobs, media_dir):
+    import manim
+
+    classes = {
+        "Text": manim.Text,
+        "MarkupText": manim.MarkupText,
+        "GlyphText": load_scene_module(SCENES_DIR / "glyph_cache.py").GlyphText,
+    }
+    warmed = 0
+    with manim.tempconfig({"media_dir": str(media_dir)}):
+        for path in sorted({Path(path) for path, _ in jobs}):
+            if path.suffix == ".py":
+                calls = literal_text_calls(path, manim)
+            else:
+                declarative = load_scene_module(SCENES_DIR / "declarative.py")
+                calls = declarative.text_calls(declarative.read_spec(path))
+            for cls_name, args, kwargs in calls:
+                try:
+                    classes[cls_name](*args, **kwargs)
+                    warmed += 1
+                except Exception:
+                    continue
+    return warmed
+
+def _render_job(path, scene_name, quality, media_dir):
+    # Воркер: исключения не роняют пул, а уходят в сводку
+    started = time.perf_counter()
+    try:
+        report = render_scene(path, scene_name, quality, media_dir=media_dir, record=False)
+        status, error = "ok", None
+    except Exception:
+        report, status, error = {}, "failed", traceback.format_exc()
+    report.update(
+        file=str(path), scene=scene_name, status=status, error=error,
+        seconds=time.perf_counter() - started,
+    )
+    return report
+
+def load_summary(media_dir):
+    path = Path(media_dir) / SUMMARY_NAME
+    return json.loads(path.read_text()) if path.exists() else {}
+
+def write_summary(media_dir, results, wall):
+    summary = {
+        "wall_seconds": wall,
+        "serial_seconds": sum(r["seconds"] for r in results),
+        "failed": [f"{r['file']}:{r['scene']}" for r in results if r["status"] != "ok"],
+        "scenes": {
+            f"{Path(r['file']).stem}.{r['scene']}": {
+                k: r.get(k) for k in ("status", "seconds", "hits", "misses", "error")
+            }
+            for r in results
+        },
+    }
+    path = Path(media_dir) / SUMMARY_NAME
+    path.write_text(json.dumps(summary, indent=1))
+    return summary
+
+def run_all(jobs, quality="l", workers=None, media_dir="media", warm=True):
+    workers = workers or os.cpu_count() or 1
+    # Самые долгие сцены (по прошлой сводке) запускаем первыми: тогда общее
+    # время ближе к времени самой долгой сцены, а не к хвосту из нее
+    previous = load_summary(media_dir).get("scenes", {})
+    jobs = sorted(jobs, key=lambda job: -(previous.get(f"{job[0].stem}.{job[1]}") or {}).get("seconds", 0.0))
+    if warm:
+        warm_text_cache(jobs, media_dir)
+
+    index = FragmentIndex(media_dir)
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)) or 1, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(_render_job, str(path), name, quality, media_dir) for path, name in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result["status"] == "ok" and result.get("partial_dir"):
+                stats = index.record(result["partial_dir"], result["fragments"], result["started"])
+                result.update(hits=stats["hits"], misses=stats["misses"])
+            print(f"[{result['status']:>6}] {Path(result['file']).stem}.{result['scene']} {result['seconds']:.1f}s")
+            results.append(result)
+    return write_summary(media_dir, results, time.perf_counter() - started)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.runner", description="Render every scene in parallel")
+    parser.add_argument("patterns", nargs="*", help="file.Scene globs, e.g. 'alphabet.*' (default: all)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--no-warm", action="store_true", help="skip pre-building Text SVGs")
+    parser.add_argument("--budget", default=os.environ.get("RENDER_CACHE_BUDGET"),
+                        help="run cache gc after rendering, e.g. 500MB")
+    parser.add_argument("--list", action="store_true", help="only print the discovered scenes")
+    args = parser.parse_args(argv)
+
+    jobs = discover_scenes()
+    if args.patterns:
+        jobs = [job for job in jobs if any(fnmatch.fnmatch(f"{job[0].stem}.{job[1]}", p) for p in args.patterns)]
+    if args.list or not jobs:
+        for path, name in jobs:
+            print(f"{path.stem}.{name}")
+        return
+
+    summary = run_all(jobs, args.quality, args.jobs, args.media_dir, warm=not args.no_warm)
+    print(f"{len(jobs)} scenes in {summary['wall_seconds']:.1f}s "
+          f"(serial {summary['serial_seconds']:.1f}s), {len(summary['failed'])} failed")
+    for name in summary["failed"]:
+        print(f"  failed: {name}")
+    if args.budget is not None:
+        result = collect_garbage(args.media_dir, parse_size(args.budget))
+        print(f"Evicted {len(result['evicted'])} fragments, {format_size(result['freed'])} freed")
+    if summary["failed"]:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
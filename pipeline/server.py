@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# --- РЕЗИДЕНТНЫЙ СЕРВЕР РЕНДЕРА ---
+# `from manim import *` в каждом модуле сцены стоит секунды, а простая сцена
+# рисуется за доли секунды. Лениво разрешать имена бесполезно: пакет manim
+# в __init__ сам импортирует всю библиотеку, так что первое же обращение к
+# любому имени тянет все. Поэтому импорт держим резидентным:
+#   python -m pipeline.server serve     - один раз импортирует manim и модули
+#                                          scenes/, слушает unix-сокет
+#   python -m pipeline.server render scenes/scene1.py LinkTest
+# Клиент manim не импортирует. На каждый запрос сервер делает fork: потомок
+# получает прогретый процесс (copy-on-write), рендерит и отвечает, а
+# состояние родителя (config, кэши модулей) остается чистым. Запросы идут
+# по одному, поэтому индекс фрагментов пишет сам потомок.
+# Этот модуль нарочно не импортирует pipeline.render на верхнем уровне.
+SOCKET_NAME = "render.sock"
+
+def default_socket(media_dir="media"):
+    return Path(media_dir) / SOCKET_NAME
+
+# --- 1. СЕРВЕР ---
+def _scenes_dir():
+    from pipeline.render import SCENES_DIR
+
+    return SCENES_DIR
+
+def _scene_modules():
+    scenes_dir = str(_scenes_dir())
+    return {
+        name: module.__file__ for name, module in list(sys.modules.items())
+        if getattr(module, "__file__", None) and str(Path(module.__file__).parent) == scenes_dir
+    }
+
+def warm_up():
+    from pipeline.render import load_scene_module
+
+    loaded = {}
+    for path in sorted(_scenes_dir().glob("*.py")):
+        try:
+            load_scene_module(path)
+        except Exception as exc:
+            print(f"Skipped {path.name}: {exc}", file=sys.stderr)
+    for name, file in _scene_modules().items():
+        loaded[name] = os.stat(file).st_mtime_ns
+    return loaded
+
+def _is_stale(modules, loaded):
+    return any(
+        not os.path.exists(file) or os.stat(file).st_mtime_ns != loaded.get(name)
+        for name, file in modules.items()
+    )
+
+# В потомке: если какой-то файл scenes/ правили после прогрева, выгружаем
+# все модули сцен (соседи импортируют друг друга) - они загрузятся заново
+def _drop_stale_modules(loaded):
+    modules = _scene_modules()
+    if _is_stale(modules, loaded):
+        for name in modules:
+            del sys.modules[name]
+
+# В родителе: то же, но с повторным прогревом - иначе после первой правки
+# каждый потомок заново импортировал бы все модули сцен
+def refresh(loaded):
+    if not _is_stale(_scene_modules(), loaded):
+        return loaded
+    _drop_stale_modules(loaded)
+    return warm_up()
+
+def _send(conn, payload):
+    conn.sendall((json.dumps(payload) + "\n").encode())
+
+def _handle(conn, request, loaded):
+    from pipeline.render import render_scene
+
+    started = time.perf_counter()
+    try:
+        _drop_stale_modules(loaded)
+        report = render_scene(
+            request["file"], request["scene"], request.get("quality", "l"),
+            options=request.get("options"), media_dir=request.get("media_dir", "media"),
+            params=request.get("params"),
+        )
+        response = {"status": "ok", **report}
+    except Exception:
+        response = {"status": "failed", "error": traceback.format_exc()}
+    response["seconds"] = time.perf_counter() - started
+    _send(conn, response)
+
+# Рендер в потомке прогретого процесса; ответ приходит через socketpair
+def render_in_fork(request, loaded):
+    ours, theirs = socket.socketpair()
+    pid = os.fork()
+    if pid == 0:
+        ours.close()
+        try:
+            _handle(theirs, request, loaded)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(0)
+    theirs.close()
+    with ours:
+        line = ours.makefile("rb").readline()
+    os.waitpid(pid, 0)
+    if not line:
+        return {"status": "failed", "error": "render process exited without a reply"}
+    return json.loads(line)
+
+def serve(socket_path):
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("The render server needs fork() and unix sockets")
+    started = time.perf_counter()
+    loaded = warm_up()
+    print(f"Warm in {time.perf_counter() - started:.1f}s ({len(loaded)} scene modules), listening on {socket_path}")
+
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        server.listen()
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    # Битый запрос или ушедший клиент не должны ронять сервер
+                    try:
+                        request = json.loads(conn.makefile("rb").readline() or b"{}")
+                        if request.get("command") == "stop":
+                            _send(conn, {"status": "stopped"})
+                            break
+                        loaded = refresh(loaded)
+                        _send(conn, render_in_fork(request, loaded))
+                    except Exception:
+                        print(f"Request failed:\n{traceback.format_exc()}", file=sys.stderr)
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+# --- 2. КЛИЕНТ ---
+def send_request(payload, socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(str(socket_path))
+        _send(conn, payload)
+        line = conn.makefile("rb").readline()
+    if not line:
+        return {"status": "failed", "error": "server closed the connection"}
+    return json.loads(line)
+
+def render(file, scene, quality="l", media_dir="media", params=None, options=None, socket_path=None):
+    payload = {
+        "file": str(Path(file).resolve()), "scene": scene, "quality": quality,
+        "media_dir": str(Path(media_dir).resolve()), "params": params, "options": options,
+    }
+    try:
+        return send_request(payload, socket_path or default_socket(media_dir))
+    except (FileNotFoundError, ConnectionRefusedError):
+        # Сервера нет - рендерим здесь, с обычным холодным стартом
+        print("Render server is not running, rendering locally", file=sys.stderr)
+        from pipeline.render import render_scene
+
+        started = time.perf_counter()
+        report = render_scene(file, scene, quality, options=options, media_dir=media_dir, params=params)
+        return {"status": "ok", **report, "seconds": time.perf_counter() - started}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.server", description="Keep manim imported between renders")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--socket", type=Path, default=None, help=f"unix socket (default: <media-dir>/{SOCKET_NAME})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start the warm server")
+    commands.add_parser("stop", help="stop a running server")
+    render_cmd = commands.add_parser("render", help="render through the server")
+    render_cmd.add_argument("file")
+    render_cmd.add_argument("scenes", nargs="+")
+    # Ключи pipeline.render.QUALITIES (сам модуль клиенту не нужен)
+    render_cmd.add_argument("-q", "--quality", choices=("h", "k", "l", "m", "p"), default="l")
+    args = parser.parse_args(argv)
+
+    socket_path = args.socket or default_socket(args.media_dir)
+    if args.command == "serve":
+        serve(socket_path)
+    elif args.command == "stop":
+        print(send_request({"command": "stop"}, socket_path)["status"])
+    else:
+        failed = False
+        for scene in args.scenes:
+            result = render(args.file, scene, args.quality, args.media_dir, socket_path=socket_path)
+            print(f"[{result['status']:>6}] {scene} {result['seconds']:.2f}s")
+            if result["status"] != "ok":
+                print(result["error"], file=sys.stderr)
+                failed = True
+        if failed:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import sys
+from pathlib import Path
+
+from pipeline.render import SCENES_DIR, SPECS_DIR, load_scene_module
+
+# --- ПРОВЕРКА ДЕКЛАРАТИВНЫХ СЦЕН ---
+# python -m pipeline.spec scenes/specs/*.json
+# Без аргументов проверяет все описания в scenes/specs. Рендер - как обычно:
+# python -m pipeline.render scenes/specs/morph_a.json MorphA
+def validate_files(paths):
+    declarative = load_scene_module(SCENES_DIR / "declarative.py")
+    problems = {}
+    for path in paths:
+        try:
+            errors = declarative.validate(declarative.read_spec(path))
+        except (OSError, ValueError, ImportError) as exc:
+            errors = [f"spec: {exc}"]
+        if errors:
+            problems[str(path)] = errors
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.spec", description="Validate declarative scene files")
+    parser.add_argument("files", nargs="*", type=Path, help="spec files (default: scenes/specs/*)")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(SPECS_DIR.glob("*.*"))
+    problems = validate_files(files)
+    for path, errors in problems.items():
+        print(f"{path}:", file=sys.stderr)
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+    print(f"{len(files) - len(problems)}/{len(files)} specs valid")
+    if problems:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import tempconfig
+
+from pipeline.render import QUALITIES, load_scene_class, render_scene
+
+# --- РЕНДЕР ОДНОЙ СЦЕНЫ КУСКАМИ ---
+# construct у наших сцен детерминирован, поэтому "снимок состояния" на
+# границе play - это просто прогон construct с пропуском предыдущих play
+# (как manim -n A,B): состояние доезжает до границы без отрисовки кадров.
+# 1. Быстрый прогон без кадров: число play и длительность каждого.
+# 2. Делим play на непрерывные куски с равной суммарной длительностью,
+#    каждый кусок рендерит свой процесс (from/upto_animation_number).
+#    Фрагменты получают те же хэши, что и при обычном рендере.
+# 3. Финальный проход в родителе: все play уже в кэше фрагментов, manim
+#    только склеивает их (concat без перекодирования).
+def measure_plays(path, scene_name, media_dir="media"):
+    scene_cls = load_scene_class(path, scene_name)
+    durations = []
+    # Кадры пропускаем через skip_animations, а не save_last_frame:
+    # тот в конце пишет PNG в media/images
+    options = {"input_file": Path(path), "media_dir": str(media_dir), "write_to_movie": False, "save_last_frame": False}
+    with tempconfig(options):
+        scene = scene_cls(skip_animations=True)
+        play = scene.renderer.play
+
+        def timed_play(scene, *args, **kwargs):
+            play(scene, *args, **kwargs)
+            durations.append(scene.duration)
+
+        scene.renderer.play = timed_play
+        scene.render()
+    return durations
+
+# Непрерывные диапазоны [a, b) индексов play с примерно равной длительностью
+def partition(durations, parts):
+    n = len(durations)
+    if n == 0:
+        return []
+    parts = max(1, min(parts, n))
+    total = sum(durations) or 1.0
+    ranges, start, acc = [], 0, 0.0
+    for i, duration in enumerate(durations):
+        acc += duration
+        left = n - (i + 1)
+        cuts_left = parts - len(ranges) - 1
+        if cuts_left > 0 and (acc >= total * (len(ranges) + 1) / parts or left == cuts_left):
+            ranges.append((start, i + 1))
+            start = i + 1
+    ranges.append((start, n))
+    return ranges
+
+def _render_range(path, scene_name, quality, media_dir, index, first, last):
+    options = {
+        "from_animation_number": first,
+        "upto_animation_number": last - 1,
+        # Свой выходной файл, чтобы куски не перезаписывали итоговое видео
+        "output_file": f"{scene_name}_part{index}",
+    }
+    started = time.perf_counter()
+    report = render_scene(path, scene_name, quality, options=options, media_dir=media_dir, record=False)
+
+    # Каталог фрагментов manim называет по классу сцены, а не по output_file:
+    # куски пишут прямо в общий кэш сцены, где их найдет финальный проход.
+    # Удаляем только склеенное видео куска (videos/<модуль>/<качество>/)
+    video_dir = Path(report["partial_dir"]).parent.parent
+    for movie in video_dir.glob(f"{options['output_file']}.*"):
+        movie.unlink(missing_ok=True)
+    return time.perf_counter() - started
+
+def render_split(path, scene_name, quality="l", workers=None, media_dir="media"):
+    durations = measure_plays(path, scene_name, media_dir)
+    ranges = partition(durations, workers or os.cpu_count() or 1)
+    timings = []
+    if len(ranges) > 1:
+        with ProcessPoolExecutor(max_workers=len(ranges), max_tasks_per_child=1) as pool:
+            futures = [
+                pool.submit(_render_range, str(path), scene_name, quality, media_dir, i, first, last)
+                for i, (first, last) in enumerate(ranges)
+            ]
+            timings = [future.result() for future in futures]
+    # Все фрагменты на месте: этот проход только склеивает и пишет индекс
+    # (для сцены из одного куска это и есть обычный рендер)
+    report = render_scene(path, scene_name, quality, media_dir=media_dir)
+    report.update(ranges=ranges, timings=timings)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.split", description="Render one scene split at play boundaries")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--media-dir", default="media")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = render_split(args.file, args.scene, args.quality, args.jobs, args.media_dir)
+    for (first, last), seconds in zip(report["ranges"], report["timings"]):
+        print(f"  plays {first}-{last - 1}: {seconds:.1f}s")
+    print(f"{args.scene}: {len(report['ranges'])} parts in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
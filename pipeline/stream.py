@@ -0,0 +1,131 @@
+import argparse
+import os
+import sys
+import time
+
+import av
+import numpy as np
+from manim import config, logger
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from pipeline.render import QUALITIES, render_scene
+
+# --- ПОТОКОВЫЙ ВЫВОД БЕЗ ФРАГМЕНТОВ ---
+# Обычный SceneFileWriter открывает новый mp4 на каждый play, а в конце
+# склеивает их. Здесь один кодировщик (PyAV, тот же, что у manim) открыт на
+# всю сцену: кадры всех play идут в него подряд, итоговый файл пишется сразу,
+# без partial_movie_files и без прохода склейки. Либо сырые RGBA-кадры уходят
+# в поток (stdout) для внешнего компоновщика.
+#
+# Кэша фрагментов здесь нет по определению: каждый play рисуется заново.
+class StreamingFileWriter(SceneFileWriter):
+    streaming = True
+
+    def __init__(self, renderer, scene_name, sink=None, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.sink = sink            # файловый объект для сырых кадров или None
+        self.container = None
+        self.stream = None
+        self.frames_written = 0
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def add_partial_movie_file(self, hash_animation):
+        self.partial_movie_files.append(None)
+        self.sections[-1].partial_movie_files.append(None)
+
+    def _open_container(self):
+        path = self.movie_file_path
+        if config.transparent and path.suffix == ".mov":
+            codec, pix_fmt, options = "qtrle", "argb", {}
+        else:
+            codec, pix_fmt, options = "libx264", "yuv420p", {"crf": "23"}
+        self.container = av.open(str(path), mode="w")
+        self.stream = self.container.add_stream(codec, rate=config.frame_rate, options=options)
+        self.stream.pix_fmt = pix_fmt
+        self.stream.width = config.pixel_width
+        self.stream.height = config.pixel_height
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if allow_write and config.write_to_movie and self.sink is None and self.container is None:
+            self._open_container()
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not config.write_to_movie:
+            return
+        frame = frame_or_renderer if isinstance(frame_or_renderer, np.ndarray) else frame_or_renderer.get_frame()
+        if self.sink is not None:
+            data = frame.tobytes()
+            for _ in range(num_frames):
+                self.sink.write(data)
+        else:
+            # Свежий VideoFrame на каждое кодирование, как в manim: метки
+            # времени и reformat привязаны к объекту кадра, повторная подача
+            # того же VideoFrame дает битые кадры
+            for _ in range(num_frames):
+                av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+                for packet in self.stream.encode(av_frame):
+                    self.container.mux(packet)
+        self.frames_written += num_frames
+
+    def finish(self):
+        if self.sink is not None:
+            self.sink.flush()
+            logger.info(
+                f"Streamed {self.frames_written} frames: rawvideo rgba "
+                f"{config.pixel_width}x{config.pixel_height} @ {config.frame_rate} fps"
+            )
+        if self.container is not None:
+            for packet in self.stream.encode():
+                self.container.mux(packet)
+            self.container.close()
+            self.container = None
+            self.print_file_ready_message(self.movie_file_path)
+
+def stream_scene(path, scene_name, quality="l", media_dir="media", sink=None, params=None, output_file=None):
+    writers = []
+
+    def use_streaming_writer(scene):
+        writer = StreamingFileWriter(scene.renderer, type(scene).__name__, sink=sink)
+        scene.renderer.file_writer = writer
+        writers.append(writer)
+
+    # Хэши play все равно не понадобятся - не считаем их
+    options = {"disable_caching": True, "write_to_movie": True}
+    if output_file is not None:
+        options["output_file"] = output_file
+    render_scene(
+        path, scene_name, quality, options=options, media_dir=media_dir, record=False,
+        setup=use_streaming_writer, params=params,
+    )
+    return writers[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.stream", description="Render a scene through one encoder, or raw frames to stdout")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--stdout", action="store_true", help="write raw RGBA frames to stdout instead of a movie")
+    args = parser.parse_args(argv)
+
+    sink = None
+    if args.stdout:
+        # Кадры - в настоящий stdout; всё остальное (логи manim, print) - в stderr
+        sink = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=1 << 22)
+        sys.stdout.flush()
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    started = time.perf_counter()
+    writer = stream_scene(args.file, args.scene, args.quality, args.media_dir, sink)
+    seconds = time.perf_counter() - started
+    if sink is not None:
+        sink.close()
+    print(f"{args.scene}: {writer.frames_written} frames in {seconds:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import ast
+import fnmatch
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+from pipeline.server import refresh, render_in_fork, warm_up
+
+# --- РЕЖИМ НАБЛЮДЕНИЯ ЗА scenes/ ---
+# python -m pipeline.watch [file.Scene globs]
+# Демон один раз импортирует manim и модули сцен, затем раз в --interval
+# смотрит на mtime файлов scenes/. Изменившийся файл разбирается в AST, и
+# перерисовываются только сцены, чей отпечаток поменялся. Отпечаток сцены -
+# AST ее класса плюс (транзитивно) все, на что класс ссылается: функции и
+# константы модуля (PALETTE, create_robot_arm), имена из соседних модулей
+# (from kinematics import IKDriver). AST без позиций и комментариев, так что
+# правка комментария или перенос строк ничего не перерисовывают.
+# Сцена рендерится целиком, но неизмененные play - попадания в кэш
+# фрагментов manim, кодируются только поменявшиеся.
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+# Имена верхнего уровня модуля -> узлы AST; импорты - отдельно
+class ModuleUnits:
+    def __init__(self, path):
+        self.path = path
+        source = path.read_text(encoding="utf-8")
+        self.tree = ast.parse(source, filename=str(path))
+        self.digest = _digest(ast.dump(self.tree))
+        self.units = {}         # имя -> узел
+        self.imports = {}       # имя -> (модуль, имя в модуле или None для import x)
+        for node in self.tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.units[node.name] = node
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    for name in ast.walk(target):
+                        if isinstance(name, ast.Name):
+                            self.units[name.id] = node
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = (node.module, alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = (alias.name, None)
+
+    def scenes(self):
+        return [
+            node.name for node in self.tree.body
+            if isinstance(node, ast.ClassDef) and any(
+                isinstance(item, ast.FunctionDef) and item.name == "construct" for item in node.body
+            )
+        ]
+
+def _used_names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+# Отпечатки по всем модулям scenes/ (модули ищутся по имени файла)
+class Fingerprinter:
+    def __init__(self, scenes_dir):
+        self.scenes_dir = Path(scenes_dir)
+        self.modules = {}
+        self.memo = {}
+
+    def module(self, name):
+        if name not in self.modules:
+            path = self.scenes_dir / f"{name}.py"
+            self.modules[name] = ModuleUnits(path) if path.exists() else None
+        return self.modules[name]
+
+    def unit(self, module_name, name, visiting=frozenset()):
+        key = (module_name, name)
+        if key in self.memo:
+            return self.memo[key]
+        module = self.module(module_name)
+        if module is None:
+            return ""           # manim и прочие внешние пакеты
+        if name is None:
+            return module.digest
+        if key in visiting:
+            return "cycle"
+        node = module.units.get(name)
+        if node is None:
+            # Реэкспорт (from strokes import X в модуле, откуда X берут дальше)
+            source = module.imports.get(name)
+            return self.unit(*source, visiting | {key}) if source else ""
+        parts = [ast.dump(node)]
+        for used in sorted(_used_names(node) - {name}):
+            if used in module.units:
+                parts.append(self.unit(module_name, used, visiting | {key}))
+            elif used in module.imports:
+                parts.append(self.unit(*module.imports[used], visiting | {key}))
+        self.memo[key] = _digest(*parts)
+        return self.memo[key]
+
+    # Методы класса по отдельности: чтобы сказать, какие части construct правили
+    def sections(self, module_name, class_name):
+        node = self.module(module_name).units[class_name]
+        return {
+            item.name: _digest(ast.dump(item)) for item in node.body
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+
+# Имя сцены из описания - тем же read_spec, что и при рендере (load_scene_class
+# сверяет его с запрошенным). Модуль declarative тянет manim, но демон и так прогрет
+def _declarative(scenes_dir):
+    from pipeline.render import load_scene_module
+
+    return load_scene_module(Path(scenes_dir) / "declarative.py")
+
+def _spec_scene(declarative, path):
+    spec = declarative.read_spec(path)
+    name = spec.get("scene") if isinstance(spec, dict) else None
+    return name if isinstance(name, str) else path.stem
+
+# (путь, сцена) -> (отпечаток, {метод: отпечаток}). Файл, который не
+# читается или не разбирается (синтаксическая ошибка, в том числе в соседе,
+# от которого он зависит; не UTF-8; удален на ходу), сохраняет прошлые
+# отпечатки: перерисуем, когда его допишут.
+def snapshot(scenes_dir, previous=None):
+    scenes_dir = Path(scenes_dir)
+    previous = previous or {}
+    fingerprints = Fingerprinter(scenes_dir)
+    state = {}
+
+    def keep_previous(path, exc):
+        print(f"{path.name}: {exc}", file=sys.stderr)
+        return {key: value for key, value in previous.items() if key[0] == path}
+
+    for path in sorted(scenes_dir.glob("*.py")):
+        try:
+            entries = {
+                (path, name): (fingerprints.unit(path.stem, name), fingerprints.sections(path.stem, name))
+                for name in fingerprints.module(path.stem).scenes()
+            }
+        except (SyntaxError, UnicodeDecodeError, OSError) as exc:
+            entries = keep_previous(path, exc)
+        state.update(entries)
+
+    specs = sorted((scenes_dir / "specs").glob("*.*"))
+    declarative = _declarative(scenes_dir) if specs else None
+    for path in specs:
+        if path.suffix not in declarative.SPEC_SUFFIXES:
+            continue
+        try:
+            entries = {(path, _spec_scene(declarative, path)): (_digest(path.read_bytes()), {})}
+        except (ValueError, ImportError, OSError) as exc:
+            entries = keep_previous(path, exc)
+        state.update(entries)
+    return state
+
+def changed_scenes(old, new):
+    changes = []
+    for key, (fingerprint, sections) in new.items():
+        before = old.get(key)
+        if before is not None and before[0] == fingerprint:
+            continue
+        if before is None:
+            what = "new"
+        else:
+            edited = sorted(m for m in sections if sections[m] != before[1].get(m))
+            what = ", ".join(edited) if edited else "dependencies" if sections else "edited"
+        changes.append((key, what))
+    return changes
+
+def _mtimes(scenes_dir):
+    paths = list(Path(scenes_dir).glob("*.py")) + list(Path(scenes_dir, "specs").glob("*.*"))
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass            # удален между glob и stat
+    return mtimes
+
+def watch(scenes_dir, patterns=(), quality="l", media_dir="media", interval=0.3, initial=False):
+    def wanted(key):
+        path, name = key
+        return not patterns or any(fnmatch.fnmatch(f"{path.stem}.{name}", p) for p in patterns)
+
+    started = time.perf_counter()
+    loaded = warm_up()
+    print(f"Warm in {time.perf_counter() - started:.1f}s, watching {scenes_dir}")
+
+    state = {} if initial else snapshot(scenes_dir)
+    mtimes = {} if initial else _mtimes(scenes_dir)
+    while True:
+        current = _mtimes(scenes_dir)
+        if current != mtimes:
+            mtimes = current
+            new_state = snapshot(scenes_dir, state)
+            for (path, name), what in changed_scenes(state, new_state):
+                if not wanted((path, name)):
+                    continue
+                print(f"{path.stem}.{name}: {what}")
+                loaded = refresh(loaded)
+                request = {"file": str(path), "scene": name, "quality": quality, "media_dir": str(Path(media_dir).resolve())}
+                result = render_in_fork(request, loaded)
+                if result["status"] == "ok":
+                    hits = f", {result['hits']} cached / {result['misses']} rendered" if "hits" in result else ""
+                    print(f"  ok in {result['seconds']:.2f}s{hits}")
+                else:
+                    print(result["error"], file=sys.stderr)
+            state = new_state
+        time.sleep(interval)
+
+def main(argv=None):
+    from pipeline.render import QUALITIES, SCENES_DIR
+
+    parser = argparse.ArgumentParser(prog="python -m pipeline.watch", description="Re-render scenes whose code changed")
+    parser.add_argument("patterns", nargs="*", help="file.Scene globs to watch (default: all)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--interval", type=float, default=0.3, help="seconds between checks")
+    parser.add_argument("--initial", action="store_true", help="render every watched scene on start")
+    args = parser.parse_args(argv)
+
+    try:
+        watch(SCENES_DIR, args.patterns, args.quality, args.media_dir, args.interval, args.initial)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
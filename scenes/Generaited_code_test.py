@@ -1,6 +1,9 @@
 from manim import *
 from manim.utils.rate_functions import ease_out_quad, ease_in_quad, ease_in_out_quad, ease_in_out_cubic
 
+from act_cache import ActCache
+from glyph_cache import GlyphText
+
 class RoboticArmToA(Scene):
     """
     DIPLOMA-LEVEL ANIMATION: Robotic Manipulator → Letter "A"
@@ -31,41 +34,45 @@ class RoboticArmToA(Scene):
         YELLOW = "#ffbe0b"
         LIGHT_GRAY = "#e0e0e0"
         
+        # Each act is cached on its own: editing one act re-renders only
+        # that act (and the ones whose starting state it changes)
+        acts = ActCache(self)
+        
         # ===== ACT 1: ABSTRACT ENERGY =====
         # Animated lines, dots, and arcs appear with motion and intention
         # They establish rhythm and spatial direction
         
-        self._act1_abstract_energy(CYAN, MAGENTA, YELLOW)
+        acts.run("act1_abstract_energy", self._act1_abstract_energy, CYAN, MAGENTA, YELLOW)
         
         # ===== ACT 2: ASSEMBLY =====
         # Abstract elements morph into recognizable mechanical parts
         # Base, joints, and arm segments emerge via Transform
         
-        arm_group = self._act2_assembly(CYAN, MAGENTA, YELLOW)
+        arm_group = acts.run("act2_assembly", self._act2_assembly, CYAN, MAGENTA, YELLOW)
         
         # ===== ACT 3: CHARACTER MOVEMENT =====
         # Manipulator performs confident, expressive motion
         # Anticipation, action, settle - like motion graphics
         
-        self._act3_character_movement(arm_group)
+        acts.run("act3_character_movement", self._act3_character_movement, arm_group)
         
         # ===== ACT 4: DECONSTRUCTION =====
         # Mechanical identity dissolves
         # Segments align, rotate, straighten - visual complexity reduces
         
-        aligned_segments = self._act4_deconstruction(arm_group)
+        aligned_segments = acts.run("act4_deconstruction", self._act4_deconstruction, arm_group)
         
         # ===== ACT 5: TYPOGRAPHIC RESOLUTION =====
         # Remaining shapes clearly form capital letter "A"
         # Letter A is built from manipulator geometry - no sudden text
         
-        letter_a = self._act5_typographic_resolution(aligned_segments, CYAN, MAGENTA, YELLOW)
+        letter_a = acts.run("act5_typographic_resolution", self._act5_typographic_resolution, aligned_segments, CYAN, MAGENTA, YELLOW)
         
         # ===== ACT 6: FINAL HOLD =====
         # Subtle camera scale or emphasis
         # Calm ending pose - minimal caption
         
-        self._act6_final_hold(letter_a, CYAN)
+        acts.run("act6_final_hold", self._act6_final_hold, letter_a, CYAN)
     
     # ========================================
     # ACT 1: ABSTRACT ENERGY
@@ -547,7 +554,7 @@ class RoboticArmToA(Scene):
         self.wait(0.5)
         
         # Optional: Add subtle caption (minimal)
-        caption = Text(
+        caption = GlyphText(
             "TRANSFORMATION",
             font_size=28,
             color=CYAN,
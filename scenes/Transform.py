@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from glyph_cache import GlyphText
+from render_layers import LayeredScene
+from robot_arm import MoveJoints, RobotArm
+from strokes import IncrementalWrite
+
 # --- 1. ПАЛИТРА ---
 PALETTE = {
     "background": "#111111", 
@@ -16,10 +21,8 @@ PALETTE = {
 # --- 2. ГЕНЕРАТОР "МОНОЛИТНОГО" РОБОТА ---
 def generate_solid_robot(points):
     # Этот метод создает робота как единую структуру с правильным порядком слоев
-    robot_group = VGroup()
-    
     # Слой 1: Рычаги (Limbs) - они находятся внизу
-    limbs = VGroup()
+    limbs = []
     for i in range(len(points) - 1):
         start = points[i]
         end = points[i+1]
@@ -31,19 +34,19 @@ def generate_solid_robot(points):
         deco = Line(start, end, stroke_width=6, color=PALETTE["body_shadow"])
         
         # Группируем звено
-        limbs.add(limb, deco)
+        limbs.append([limb, deco])
     
     # Слой 2: Суставы (Joints) - они лежат ПОВЕРХ рычагов
-    joints = VGroup()
+    joints = []
     for i, point in enumerate(points):
-        if i == 0: continue # Базу пропускаем
-        
-        if i == len(points) - 1: # Кончик (Лапа)
+        if i == 0: # Базу пропускаем
+            joints.append([])
+        elif i == len(points) - 1: # Кончик (Лапа)
             foot = RoundedRectangle(corner_radius=0.1, height=0.3, width=0.6, color=PALETTE["joint_color"], fill_opacity=1).move_to(point)
             # Неоновое свечение внутри лапы
             core = Dot(point, color=PALETTE["accent"], radius=0.1)
             glow = Dot(point, color=PALETTE["accent"], radius=0.4, fill_opacity=0.3)
-            joints.add(foot, glow, core)
+            joints.append([foot, glow, core])
         else: # Промежуточные шарниры
             # Внешний круг (темный)
             outer = Dot(point, radius=0.25, color=PALETTE["joint_color"])
@@ -51,11 +54,10 @@ def generate_solid_robot(points):
             inner = Dot(point, radius=0.12, color=PALETTE["body_main"])
             # Центр (болт)
             bolt = Dot(point, radius=0.04, color=PALETTE["joint_color"])
-            joints.add(outer, inner, bolt)
+            joints.append([outer, inner, bolt])
 
-    # ВАЖНО: Добавляем в таком порядке, чтобы суставы перекрывали концы линий
-    robot_group.add(limbs, joints)
-    return robot_group
+    # ВАЖНО: RobotArm кладет звенья первыми, чтобы суставы перекрывали концы линий
+    return RobotArm(points, links=limbs, joints=joints)
 
 # --- 3. ГЕНЕРАТОР БАЗЫ ---
 def create_heavy_base(position):
@@ -69,7 +71,10 @@ def create_heavy_base(position):
     return group
 
 # --- 4. ОСНОВНАЯ СЦЕНА ---
-class MorphScene(Scene):
+class MorphScene(LayeredScene):
+    # Буква, в которую превращается робот (параметр пакетного рендера)
+    letter = "A"
+
     def construct(self):
         self.camera.background_color = PALETTE["background"]
         grid = NumberPlane(background_line_style={"stroke_color": PALETTE["grid"], "stroke_opacity": 0.3})
@@ -108,9 +113,8 @@ class MorphScene(Scene):
         # 1. База
         base = create_heavy_base(P1_BASE)
         
-        # 2. Роботы (Создаем два состояния)
-        robot_idle = generate_solid_robot(points_idle)
-        robot_pose_a = generate_solid_robot(points_pose_a)
+        # 2. Робот (один; поза А задается углами суставов, второй робот не нужен)
+        robot = generate_solid_robot(points_idle)
         
         # 3. Лазер
         laser_start = P2_JOINT
@@ -120,7 +124,7 @@ class MorphScene(Scene):
         laser_beam = Line(laser_start, laser_end, color=PALETTE["laser"], stroke_width=0)
 
         # 4. Буква А (Итоговая)
-        letter_A = Text("A", font="Arial", font_size=550, weight=BOLD, slant=ITALIC, color=PALETTE["accent"])
+        letter_A = GlyphText(self.letter, font="Arial", font_size=550, weight=BOLD, slant=ITALIC, color=PALETTE["accent"])
         # Тонкая подстройка позиции буквы под робота
         letter_A.move_to(ORIGIN).shift(DOWN*0.1 + LEFT*0.1)
 
@@ -131,13 +135,13 @@ class MorphScene(Scene):
         
         # 2. Появление Робота (ЧЕРЧЕНИЕ)
         # Create рисует контуры, это предотвращает "разлет" деталей
-        self.play(Create(robot_idle), run_time=2)
+        self.play(Create(robot), run_time=2)
         self.wait(0.5)
 
         # 3. Трансформация в Позу А
-        # ReplacementTransform здесь сработает идеально, так как структура объектов идентична
+        # Интерполируем суставы, звенья просто перерисовываются по новой позе
         self.play(
-            ReplacementTransform(robot_idle, robot_pose_a),
+            MoveJoints(robot, points=points_pose_a),
             run_time=2.5,
             rate_func=rush_into
         )
@@ -152,8 +156,7 @@ class MorphScene(Scene):
         self.wait(0.3)
 
         # Группировка для финала
-        # Важно: robot_idle уже превратился в robot_pose_a, поэтому группируем robot_pose_a
-        full_assembly = VGroup(base, robot_pose_a, laser_beam)
+        full_assembly = VGroup(base, robot, laser_beam)
 
         # 5. Метаморфоза в Букву
         big_flash = Flash(ORIGIN, color=WHITE, line_length=6, num_lines=60, flash_radius=2.5, run_time=0.8)
@@ -169,8 +172,8 @@ class MorphScene(Scene):
         self.play(letter_A.animate.set_color(WHITE), run_time=0.2)
         self.play(letter_A.animate.set_color(PALETTE["accent"]), run_time=0.5)
 
-        title = Text("VISUALIZATION", font="Arial", font_size=32, color=GRAY, weight=BOLD)
+        title = GlyphText("VISUALIZATION", font="Arial", font_size=32, color=GRAY, weight=BOLD)
         title.next_to(letter_A, DOWN, buff=0.5)
-        self.play(Write(title))
+        self.play(IncrementalWrite(title))
         
         self.wait(3)
\ No newline at end of file
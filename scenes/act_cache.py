@@ -0,0 +1,100 @@
+from manim import *
+from manim.utils.hashing import get_hash_from_play_call
+
+import hashlib
+import inspect
+import json
+from pathlib import Path
+
+from profiling import profile_span
+
+# --- КЭШ ПО АКТАМ ---
+# Акт = метод сцены. Отпечаток акта: его исходник, аргументы и состояние
+# мобжектов (плюс камера) на входе. Для отрендеренного акта запоминаем список
+# partial movie файлов, которые записали его play. При совпадении отпечатка
+# акт идет в секции с skip_animations (код выполняется, состояние сцены
+# доезжает до конца акта, кадры не рисуются), а пустые слоты его play
+# заполняются сохраненными фрагментами - финальное видео склеивает сам manim.
+# Число play у акта с тем же исходником то же, поэтому индексы слотов
+# (file writer адресует их по renderer.num_plays) не сдвигаются.
+#
+# Изменения во вспомогательных модулях (robot_arm.py и т.п.) в отпечаток не
+# входят: после них кэш актов нужно сбросить (удалить media/act_cache).
+class ActCache:
+    def __init__(self, scene, cache_dir=None):
+        self.scene = scene
+        self.cache_dir = Path(cache_dir or Path(config.media_dir) / "act_cache" / type(scene).__name__)
+        # Без записи видео, с отключенным кэшем фрагментов или с потоковым
+        # writer (pipeline.stream, фрагментов нет вовсе) кэшировать нечего
+        self.enabled = (
+            config.write_to_movie and not config.dry_run and not config.disable_caching
+            and not getattr(scene.renderer.file_writer, "streaming", False)
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, name, fn, args):
+        state = get_hash_from_play_call(self.scene, self.scene.camera, [], self.scene.mobjects)
+        digest = hashlib.sha256()
+        for part in (name, inspect.getsource(fn), repr(args), state):
+            digest.update(part.encode())
+        return digest.hexdigest()[:16]
+
+    def _load(self, manifest):
+        if not manifest.exists():
+            return None
+        fragments = json.loads(manifest.read_text())
+        writer = self.scene.renderer.file_writer
+        paths = []
+        for fragment in fragments:
+            if fragment is None:
+                paths.append(None)
+                continue
+            path = Path(writer.partial_movie_directory) / f"{fragment}{config.movie_file_extension}"
+            if not path.exists():
+                return None
+            paths.append(str(path))
+        return paths
+
+    # Акт - именованный спан в профиле сцены (если профилировщик подключен)
+    def run(self, name, fn, *args):
+        with profile_span(self.scene, name):
+            return self._run(name, fn, *args)
+
+    def _run(self, name, fn, *args):
+        if not self.enabled:
+            return fn(*args)
+
+        key = self.fingerprint(name, fn, args)
+        manifest = self.cache_dir / f"{name}_{key}.json"
+        cached = self._load(manifest)
+        writer = self.scene.renderer.file_writer
+
+        if cached is not None:
+            logger.info(f"Act '{name}' is cached, skipping its rendering")
+            self.hits += 1
+            self.scene.next_section(name, skip_animations=True)
+            section = writer.sections[-1]
+            first = len(writer.partial_movie_files)
+            result = fn(*args)
+            slots = range(first, len(writer.partial_movie_files))
+            if len(slots) != len(cached):
+                raise RuntimeError(f"Act '{name}' made {len(slots)} plays, cache has {len(cached)}")
+            offset = len(section.partial_movie_files) - len(cached)
+            for i, path in enumerate(cached):
+                writer.partial_movie_files[first + i] = path
+                section.partial_movie_files[offset + i] = path
+            return result
+
+        self.misses += 1
+        self.scene.next_section(name)
+        section = writer.sections[-1]
+        result = fn(*args)
+        fragments = [Path(f).stem if f is not None else None for f in section.partial_movie_files]
+        # Часть play пропущена (рендер куском через -n / pipeline.split) -
+        # такой акт неполный, в кэш его не кладем
+        if None in fragments:
+            return result
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps(fragments))
+        return result
@@ -1,6 +1,13 @@
 from manim import *
 import numpy as np
 
+from glyph_cache import GlyphText
+from kinematics import IKDriver
+from render_layers import LayeredScene
+from robot_arm import RobotArm
+from strokes import StrokePlan, WriteStrokePlan
+from updaters import depends_on
+
 # --- 1. ПАЛИТРА ---
 PALETTE = {
     "background": "#0F0F0F",
@@ -12,20 +19,24 @@ PALETTE = {
     "grid": "#222222",
 }
 
+LINK1_LEN = 2.2
+LINK2_LEN = 1.8
+
 # --- 2. ГЕНЕРАТОРЫ ---
 def create_robot_arm(accent_color, link_color):
-    link1 = Line(ORIGIN, UP * 2.2, color=link_color, stroke_width=8)
-    joint1 = Circle(radius=0.15, color=GREY, fill_opacity=1, fill_color=BLACK).move_to(ORIGIN)
-    link2 = Line(link1.get_end(), link1.get_end() + UP * 1.8, color=link_color, stroke_width=8)
-    joint2 = Circle(radius=0.12, color=GREY, fill_opacity=1, fill_color=BLACK).move_to(link1.get_end())
+    points = [ORIGIN, UP * LINK1_LEN, UP * (LINK1_LEN + LINK2_LEN)]
+    link1 = Line(points[0], points[1], color=link_color, stroke_width=8)
+    joint1 = Circle(radius=0.15, color=GREY, fill_opacity=1, fill_color=BLACK).move_to(points[0])
+    link2 = Line(points[1], points[2], color=link_color, stroke_width=8)
+    joint2 = Circle(radius=0.12, color=GREY, fill_opacity=1, fill_color=BLACK).move_to(points[1])
     
     head = VGroup()
     casing = RoundedRectangle(corner_radius=0.05, height=0.4, width=0.3, color=GREY_D, fill_opacity=1)
     lens = Dot(radius=0.08, color=accent_color)
     glow = Dot(radius=0.2, color=accent_color, fill_opacity=0.3)
-    head.add(casing, glow, lens).move_to(link2.get_end())
+    head.add(casing, glow, lens).move_to(points[2])
     
-    return VGroup(link1, link2, head, joint1, joint2)
+    return RobotArm(points, links=[[link1], [link2]], joints=[[joint1], [joint2], [head]])
 
 def create_base(position):
     base = VGroup()
@@ -35,14 +46,21 @@ def create_base(position):
     return base
 
 # --- 3. ОСНОВНАЯ СЦЕНА ---
-class LaserWritingScene(Scene):
+class LaserWritingScene(LayeredScene):
+    # Что пишем (параметр пакетного рендера: python -m pipeline.batch ... -p word=...)
+    word = "Misha"
+    # "text" - штрихи в порядке текста, "shortest" - минимальный холостой ход
+    stroke_order = "text"
+    # True - позы руки запекаются заранее, False - классические апдейтеры
+    bake = True
+
     def construct(self):
         self.camera.background_color = PALETTE["background"]
         grid = NumberPlane(background_line_style={"stroke_color": PALETTE["grid"], "stroke_opacity": 0.4})
         self.add(grid)
 
         # --- НАСТРОЙКА ТЕКСТА ---
-        text_group = Text("Misha", font="Arial", font_size=144, weight=BOLD)
+        text_group = GlyphText(self.word, font="Arial", font_size=144, weight=BOLD)
         text_group.move_to(UP * 1.5)
         text_group.set_fill(opacity=0).set_stroke(color=PALETTE["text_burn"], width=0)
 
@@ -52,55 +70,43 @@ class LaserWritingScene(Scene):
         robot = create_robot_arm(PALETTE["accent"], PALETTE["link"])
         robot.move_to(base_pos + UP*0.2)
         
-        target_dot = Dot(radius=0).move_to(robot[2].get_center())
+        target_dot = Dot(radius=0).move_to(robot.tool.get_center())
+
+        # --- ЛАЗЕР (С ЗАЩИТОЙ ОТ ОШИБОК) ---
+        laser_beam = Line(stroke_width=0, color=PALETTE["laser_beam"])
+        spark = Dot(radius=0.08, color=YELLOW).set_opacity(0)
 
         # --- ЛОГИКА IK (Inverse Kinematics) ---
+        # Решение считается пачкой на всю траекторию (см. kinematics.py),
+        # апдейтер только забирает готовую строку текущего кадра.
+        def arm_rig(targets, elbows):
+            origins = np.broadcast_to(ik.origin, targets.shape)
+            # Луч, как и в laser_updater, - микроскопический отрезок от головы
+            return {
+                "arms": [(robot, np.stack([origins, elbows, targets], axis=1))],
+                "lines": [(laser_beam, targets, targets + RIGHT * 0.01)],
+                "movers": [(spark, targets)],
+            }
+
+        # В bake-режиме позы всех звеньев запекаются в FollowTrack, апдейтеры не вешаем
+        # Центры цели и головы читают три апдейтера - считаем их раз за кадр
+        center = self.ledger.center
+        ik = IKDriver(
+            target_dot, robot.get_joint_positions()[0], LINK1_LEN, LINK2_LEN,
+            rig=arm_rig if self.bake else None, center=center,
+        )
+
+        # Зависимости объявлены: порядок апдейтеров не зависит от порядка self.add,
+        # а на wait с неподвижной целью они пропускаются
+        @depends_on(target_dot)
         def robot_updater(mob):
-            target = target_dot.get_center()
-            l1, l2, head, j1, j2 = mob
-            origin = j1.get_center()
-            
-            len1 = 2.2
-            len2 = 1.8
-            
-            vec = target - origin
-            dist = np.linalg.norm(vec)
-            
-            max_len = len1 + len2 - 0.01
-            if dist > max_len:
-                vec = vec * (max_len / dist)
-                dist = max_len
-            elif dist < 0.1:
-                dist = 0.1
-                
-            angle_base = np.arctan2(vec[1], vec[0])
-            
-            cos_angle_mid = (dist**2 - len1**2 - len2**2) / (2 * len1 * len2)
-            cos_angle_mid = np.clip(cos_angle_mid, -1.0, 1.0)
-            angle_mid = np.arccos(cos_angle_mid)
-            
-            cos_angle_a = (len1**2 + dist**2 - len2**2) / (2 * len1 * dist)
-            cos_angle_a = np.clip(cos_angle_a, -1.0, 1.0)
-            angle_a = np.arccos(cos_angle_a)
-            
-            final_angle1 = angle_base + angle_a
-            
-            new_elbow_pos = origin + np.array([np.cos(final_angle1), np.sin(final_angle1), 0]) * len1
-            l1.put_start_and_end_on(origin, new_elbow_pos)
-            j2.move_to(new_elbow_pos)
-            
-            l2.put_start_and_end_on(new_elbow_pos, target)
-            head.move_to(target)
-            head.rotate(0) 
+            target, new_elbow_pos = ik.pose()
+            mob.set_joint_positions([ik.origin, new_elbow_pos, target])
 
-        robot.add_updater(robot_updater)
-        
-        # --- ЛАЗЕР (С ЗАЩИТОЙ ОТ ОШИБОК) ---
-        laser_beam = Line(stroke_width=0, color=PALETTE["laser_beam"])
-        
+        @depends_on(robot.tool, target_dot)
         def laser_updater(beam):
-            start = robot[2].get_center()
-            end = target_dot.get_center()
+            start = center(robot.tool)
+            end = center(target_dot)
             
             # ЗАЩИТА: Если точки слишком близко, чуть сдвигаем конец
             if np.linalg.norm(end - start) < 0.01:
@@ -112,10 +118,12 @@ class LaserWritingScene(Scene):
                 # Даже когда лазер выключен, держим его длину не нулевой
                 beam.put_start_and_end_on(start, start + RIGHT * 0.01)
 
-        laser_beam.add_updater(laser_updater)
-
-        spark = Dot(radius=0.08, color=YELLOW).set_opacity(0)
-        spark.add_updater(lambda s: s.move_to(target_dot.get_center()))
+        if self.bake:
+            ik.snap()
+        else:
+            robot.add_updater(robot_updater)
+            laser_beam.add_updater(laser_updater)
+            spark.add_updater(depends_on(target_dot)(lambda s: s.move_to(center(target_dot))))
 
         self.add(base, robot, laser_beam, spark)
 
@@ -124,60 +132,18 @@ class LaserWritingScene(Scene):
         self.play(FadeIn(robot), run_time=1)
         self.wait(0.5)
 
-        # --- ЦИКЛ РИСОВАНИЯ ---
-        for i, letter in enumerate(text_group):
-            
-            # Manim хранит части буквы в submobjects. Если их нет, значит буква цельная.
-            parts = letter.submobjects if len(letter.submobjects) > 0 else [letter]
-            
-            for part in parts:
-                # 1. Подготовка: летим к началу части
-                # ИСПРАВЛЕНИЕ: Используем универсальный способ получить начало кривой
-                if hasattr(part, "get_start"):
-                    start_point = part.get_start()
-                else:
-                    # Если вдруг метод не сработает, берем центр (как запасной вариант)
-                    start_point = part.get_center()
-
-                self.play(
-                    target_dot.animate.move_to(start_point),
-                    run_time=0.5,
-                    rate_func=smooth
-                )
-
-                # 2. Включаем лазер
-                self.play(
-                    laser_beam.animate.set_stroke_width(4).set_stroke_opacity(1),
-                    spark.animate.set_opacity(1),
-                    run_time=0.05
-                )
-
-                # 3. Рисуем
-                part.set_stroke(color=PALETTE["text_burn"], width=4)
-                
-                self.play(
-                    MoveAlongPath(target_dot, part),
-                    Create(part),
-                    run_time=0.8,
-                    rate_func=linear
-                )
-
-                # 4. Выключаем лазер
-                self.play(
-                    laser_beam.animate.set_stroke_width(0).set_stroke_opacity(0),
-                    spark.animate.set_opacity(0),
-                    run_time=0.05
-                )
-            
-            # Остывание
-            self.play(
-                letter.animate.set_stroke(color=PALETTE["text_cool"], width=0).set_fill(color=WHITE, opacity=1),
-                run_time=0.2
-            )
+        # --- ПЛАН РИСОВАНИЯ ---
+        # Все слово идет одним play: перелеты, лазер, прожиг и остывание
+        # заранее разложены по шкале времени (см. strokes.py).
+        plan = StrokePlan(text_group, start_point=target_dot.get_center(), order=self.stroke_order)
+        self.play(
+            ik.follow(plan.point_at, run_time=plan.duration),
+            WriteStrokePlan(plan, laser_beam, spark, PALETTE["text_burn"], PALETTE["text_cool"]),
+        )
 
         # --- ФИНАЛ ---
         park_pos = base_pos + UP * 1.5 + RIGHT * 3
-        self.play(target_dot.animate.move_to(park_pos), run_time=1.5, rate_func=smooth)
+        self.play(ik.move_to(park_pos, run_time=1.5, rate_func=smooth))
         
         self.play(
             text_group.animate.scale(1.2).set_color(PALETTE["accent"]),
@@ -0,0 +1,40 @@
+from manim import *
+import numpy as np
+
+from robot_arm import chain_state
+
+# --- 1. ОТРЕЗКИ ПАЧКОЙ ---
+# Опорные точки прямого Line (одна кубическая кривая, ручки на 1/3 и 2/3)
+# сразу для всех кадров: (N, 4, 3). То же, что строит put_start_and_end_on.
+def line_points(starts, ends):
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    t = np.linspace(0, 1, 4)[None, :, None]
+    return starts[:, None, :] + (ends - starts)[:, None, :] * t
+
+# --- 2. ЗАПЕЧЕННЫЕ КАДРЫ ---
+# lines: [(Line, starts, ends)], movers: [(mobject, centers)], все по (N, 3);
+# arms: [(RobotArm, joints)] с позициями суставов (N, n+1, 3).
+# На кадр - только копирование готовых точек, без перестроения линий.
+class BakedFrames:
+    def __init__(self, lines=(), movers=(), arms=()):
+        self.lines = [(mob, line_points(starts, ends)) for mob, starts, ends in lines]
+        self.movers = [(mob, np.asarray(centers, dtype=float)) for mob, centers in movers]
+        self.arms = []
+        for arm, joints in arms:
+            joints = np.asarray(joints, dtype=float)
+            # Углы и длины для всех кадров одним вызовом
+            angles, lengths = chain_state(joints)
+            self.arms.append((arm, joints[:, 0], angles, lengths))
+
+    # Все мобжекты, которые двигает запекание
+    def mobjects(self):
+        return [arm for arm, *_ in self.arms] + [mob for mob, _ in self.lines] + [mob for mob, _ in self.movers]
+
+    def apply(self, index):
+        for arm, origins, angles, lengths in self.arms:
+            arm.set_world_pose(origins[index], angles[index], lengths[index])
+        for mob, points in self.lines:
+            mob.set_points(points[index])
+        for mob, centers in self.movers:
+            mob.move_to(centers[index])
@@ -0,0 +1,360 @@
+from manim import *
+from manim.utils import rate_functions
+import manim
+import numpy as np
+
+import json
+from pathlib import Path
+
+from glyph_cache import GlyphText
+from render_layers import LayeredScene
+from robot_arm import MoveJoints, RobotArm
+from strokes import IncrementalCreate, IncrementalWrite
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# --- 1. ФОРМАТ ОПИСАНИЯ СЦЕНЫ ---
+# Сцена как данные (JSON, YAML или msgpack) вместо сгенерированного модуля:
+# {
+#   "version": 1, "scene": "MorphA", "background": "$background",
+#   "palette": {"accent": "#00E5FF", ...},
+#   "mobjects": {"base": {"type": "RoundedRectangle", "args": [], "kwargs": {...},
+#                         "calls": [["move_to", [-1.2, -2]]]}, ...},
+#   "timeline": [{"play": [{"type": "Create", "args": ["@robot"]}], "run_time": 2},
+#                {"animate": ...}, {"wait": 0.5}, {"add": ["@grid"]}, ...]
+# }
+# Значения: "$имя" - цвет из palette, "@имя" - мобжект, объявленный выше,
+# список из 2-3 чисел - точка. Вызов метода - [имя, *аргументы], последний
+# аргумент-словарь уходит в kwargs. Анимация - {"type", "args", "kwargs"} или
+# {"animate": "@имя", "calls": [...], "kwargs": {...}} (как mob.animate...).
+SPEC_VERSION = 1
+SPEC_SUFFIXES = (".json", ".yaml", ".yml", ".msgpack")
+TIMELINE_ACTIONS = ("play", "wait", "add", "remove", "set")
+PLAY_OPTIONS = ("run_time", "rate_func", "lag_ratio")
+TEXT_TYPES = ("Text", "MarkupText", "GlyphText")
+
+# Наши классы поверх пространства имен manim
+EXTRA_MOBJECTS = {"GlyphText": GlyphText, "RobotArm": RobotArm}
+EXTRA_ANIMATIONS = {
+    "MoveJoints": MoveJoints,
+    "IncrementalCreate": IncrementalCreate,
+    "IncrementalWrite": IncrementalWrite,
+}
+
+def read_spec(path):
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    if suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError(f"PyYAML is required to read {path}")
+        return yaml.safe_load(path.read_text(encoding="utf-8"))
+    if suffix == ".msgpack":
+        if msgpack is None:
+            raise ImportError(f"msgpack is required to read {path}")
+        return msgpack.unpackb(path.read_bytes(), raw=False)
+    raise ValueError(f"Unknown scene spec format: {path}")
+
+def _lookup(name, extra, base):
+    if not isinstance(name, str):
+        return None
+    cls = extra.get(name) or getattr(manim, name, None)
+    return cls if isinstance(cls, type) and issubclass(cls, base) else None
+
+def mobject_type(name):
+    return _lookup(name, EXTRA_MOBJECTS, Mobject)
+
+def animation_type(name):
+    return _lookup(name, EXTRA_ANIMATIONS, Animation)
+
+def rate_func(name):
+    fn = getattr(rate_functions, name, None) if isinstance(name, str) else None
+    return fn if callable(fn) else None
+
+def _is_point(value):
+    return (
+        isinstance(value, list) and 2 <= len(value) <= 3
+        and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in value)
+    )
+
+def _split_call(call):
+    args = list(call[1:])
+    kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+    return call[0], args, kwargs
+
+# --- 2. ПРОВЕРКА ---
+# Все ошибки сразу, с путем до поля:
+#   timeline[3].play[0].type: unknown animation 'Fade'
+def validate(spec):
+    errors = []
+
+    def error(where, message):
+        errors.append(f"{where}: {message}")
+
+    if not isinstance(spec, dict):
+        return ["spec: expected a mapping"]
+    if spec.get("version") != SPEC_VERSION:
+        error("version", f"expected {SPEC_VERSION}, got {spec.get('version')!r}")
+    name = spec.get("scene")
+    if not (isinstance(name, str) and name.isidentifier()):
+        error("scene", f"expected a class name, got {name!r}")
+
+    palette = spec.get("palette", {})
+    if not isinstance(palette, dict):
+        error("palette", "expected a mapping")
+        palette = {}
+    for key, color in palette.items():
+        if not isinstance(color, str):
+            error(f"palette.{key}", f"expected a color string, got {color!r}")
+
+    defined = {}    # имя -> класс мобжекта
+
+    def check_value(where, value):
+        if isinstance(value, str):
+            if value.startswith("$") and value[1:] not in palette:
+                error(where, f"unknown palette color {value!r}")
+            elif value.startswith("@") and value[1:] not in defined:
+                error(where, f"unknown mobject {value!r}")
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                check_value(f"{where}[{i}]", item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key == "rate_func" and rate_func(item) is None:
+                    error(f"{where}.{key}", f"unknown rate function {item!r}")
+                else:
+                    check_value(f"{where}.{key}", item)
+
+    def check_args(where, entry):
+        args, kwargs = entry.get("args", []), entry.get("kwargs", {})
+        if not isinstance(args, list):
+            error(f"{where}.args", "expected a list")
+        else:
+            check_value(f"{where}.args", args)
+        if not isinstance(kwargs, dict):
+            error(f"{where}.kwargs", "expected a mapping")
+        else:
+            check_value(f"{where}.kwargs", kwargs)
+
+    def check_calls(where, cls, calls):
+        if not isinstance(calls, list):
+            error(where, "expected a list of [method, *args]")
+            return
+        for i, call in enumerate(calls):
+            at = f"{where}[{i}]"
+            if not (isinstance(call, list) and call and isinstance(call[0], str)):
+                error(at, "expected [method, *args]")
+                continue
+            # get_*/set_* manim достраивает на лету (Mobject.__getattr__)
+            dynamic = call[0].startswith(("get_", "set_"))
+            if cls is not None and not dynamic and not callable(getattr(cls, call[0], None)):
+                error(at, f"{cls.__name__} has no method {call[0]!r}")
+            check_value(at, call[1:])
+
+    def check_ref(where, ref):
+        if not (isinstance(ref, str) and ref.startswith("@")):
+            error(where, f"expected a mobject reference '@name', got {ref!r}")
+            return None
+        if ref[1:] not in defined:
+            error(where, f"unknown mobject {ref!r}")
+            return None
+        return defined[ref[1:]]
+
+    def check_keys(where, entry, allowed):
+        for key in set(entry) - set(allowed):
+            error(where, f"unexpected key {key!r}")
+
+    if "background" in spec:
+        check_value("background", spec["background"])
+
+    mobjects = spec.get("mobjects", {})
+    if not isinstance(mobjects, dict):
+        error("mobjects", "expected a mapping")
+        mobjects = {}
+    for name, entry in mobjects.items():
+        where = f"mobjects.{name}"
+        if not name.isidentifier():
+            error(where, "mobject names must be identifiers")
+        if not isinstance(entry, dict):
+            error(where, "expected a mapping")
+            continue
+        check_keys(where, entry, ("type", "args", "kwargs", "calls"))
+        cls = mobject_type(entry.get("type"))
+        if cls is None:
+            error(f"{where}.type", f"unknown mobject type {entry.get('type')!r}")
+        check_args(where, entry)
+        check_calls(f"{where}.calls", cls, entry.get("calls", []))
+        # Объявлен только после своих аргументов: ссылок на себя нет
+        defined[name] = cls
+
+    timeline = spec.get("timeline", [])
+    if not isinstance(timeline, list):
+        error("timeline", "expected a list")
+        timeline = []
+    for i, step in enumerate(timeline):
+        where = f"timeline[{i}]"
+        if not isinstance(step, dict):
+            error(where, "expected a mapping")
+            continue
+        actions = [key for key in TIMELINE_ACTIONS if key in step]
+        if len(actions) != 1:
+            error(where, f"expected exactly one of {', '.join(TIMELINE_ACTIONS)}")
+            continue
+        action = actions[0]
+        if action == "wait":
+            check_keys(where, step, ("wait",))
+            duration = step["wait"]
+            if not (isinstance(duration, (int, float)) and duration > 0):
+                error(f"{where}.wait", f"expected a positive duration, got {duration!r}")
+        elif action in ("add", "remove"):
+            check_keys(where, step, (action,))
+            refs = step[action]
+            if not isinstance(refs, list):
+                error(f"{where}.{action}", "expected a list of mobject references")
+                continue
+            for j, ref in enumerate(refs):
+                check_ref(f"{where}.{action}[{j}]", ref)
+        elif action == "set":
+            check_keys(where, step, ("set", "calls"))
+            cls = check_ref(f"{where}.set", step["set"])
+            check_calls(f"{where}.calls", cls, step.get("calls", []))
+        else:
+            check_keys(where, step, ("play",) + PLAY_OPTIONS)
+            check_value(where, {key: step[key] for key in PLAY_OPTIONS if key in step})
+            run_time = step.get("run_time", 1)
+            if not (isinstance(run_time, (int, float)) and run_time > 0):
+                error(f"{where}.run_time", f"expected a positive duration, got {run_time!r}")
+            anims = step["play"]
+            if not (isinstance(anims, list) and anims):
+                error(f"{where}.play", "expected a non-empty list of animations")
+                continue
+            for j, anim in enumerate(anims):
+                at = f"{where}.play[{j}]"
+                if not isinstance(anim, dict):
+                    error(at, "expected a mapping")
+                elif "animate" in anim:
+                    check_keys(at, anim, ("animate", "calls", "kwargs"))
+                    cls = check_ref(f"{at}.animate", anim["animate"])
+                    check_calls(f"{at}.calls", cls, anim.get("calls", []))
+                    check_args(at, anim)
+                else:
+                    check_keys(at, anim, ("type", "args", "kwargs"))
+                    if animation_type(anim.get("type")) is None:
+                        error(f"{at}.type", f"unknown animation {anim.get('type')!r}")
+                    check_args(at, anim)
+    return errors
+
+# --- 3. СБОРКА СЦЕНЫ ---
+class SpecBuilder:
+    def __init__(self, spec):
+        self.spec = spec
+        self.palette = spec.get("palette", {})
+        self.mobjects = {}
+
+    def value(self, value):
+        if isinstance(value, str):
+            if value.startswith("$"):
+                return self.palette[value[1:]]
+            if value.startswith("@"):
+                return self.mobjects[value[1:]]
+            return value
+        if _is_point(value):
+            point = np.zeros(3)
+            point[:len(value)] = value
+            return point
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        if isinstance(value, dict):
+            return {
+                key: rate_func(item) if key == "rate_func" else self.value(item)
+                for key, item in value.items()
+            }
+        return value
+
+    def arguments(self, entry):
+        return [self.value(arg) for arg in entry.get("args", [])], self.value(entry.get("kwargs", {}))
+
+    # Цепочка вызовов; для .animate каждый вызов возвращает тот же builder
+    def call(self, target, calls):
+        for call in calls:
+            method, args, kwargs = _split_call(call)
+            result = getattr(target, method)(*[self.value(arg) for arg in args], **self.value(kwargs))
+            target = result if result is not None else target
+        return target
+
+    def build_mobjects(self):
+        for name, entry in self.spec.get("mobjects", {}).items():
+            args, kwargs = self.arguments(entry)
+            mob = mobject_type(entry["type"])(*args, **kwargs)
+            self.mobjects[name] = self.call(mob, entry.get("calls", []))
+
+    def animation(self, anim):
+        if "animate" in anim:
+            builder = self.value(anim["animate"]).animate
+            _, kwargs = self.arguments(anim)
+            if kwargs:
+                builder = builder(**kwargs)
+            return self.call(builder, anim.get("calls", []))
+        args, kwargs = self.arguments(anim)
+        return animation_type(anim["type"])(*args, **kwargs)
+
+    def run(self, scene):
+        self.build_mobjects()
+        if "background" in self.spec:
+            scene.camera.background_color = self.value(self.spec["background"])
+        for step in self.spec.get("timeline", []):
+            if "wait" in step:
+                scene.wait(step["wait"])
+            elif "add" in step:
+                scene.add(*self.value(step["add"]))
+            elif "remove" in step:
+                scene.remove(*self.value(step["remove"]))
+            elif "set" in step:
+                self.call(self.value(step["set"]), step.get("calls", []))
+            else:
+                options = self.value({key: step[key] for key in PLAY_OPTIONS if key in step})
+                scene.play(*[self.animation(anim) for anim in step["play"]], **options)
+
+def scene_class(spec, base=LayeredScene):
+    errors = validate(spec)
+    if errors:
+        name = spec.get("scene") if isinstance(spec, dict) else None
+        raise ValueError(f"Invalid scene spec {name!r}:\n  " + "\n  ".join(errors))
+
+    def construct(self):
+        SpecBuilder(spec).run(self)
+
+    return type(spec["scene"], (base,), {"construct": construct, "spec": spec, "__module__": __name__})
+
+# Класс на файл, пока файл не изменился: сотни вариантов букв
+# в одном процессе читаются и проверяются по одному разу
+_loaded = {}
+
+def load_scene_spec(path):
+    path = Path(path).resolve()
+    stamp = path.stat().st_mtime_ns
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _loaded[path] = (stamp, scene_class(read_spec(path)))
+    return cached[1]
+
+# Текстовые мобжекты с готовыми аргументами (для прогрева кэша текстов)
+def text_calls(spec):
+    builder = SpecBuilder(spec)
+    for entry in spec.get("mobjects", {}).values():
+        if entry.get("type") not in TEXT_TYPES:
+            continue
+        try:
+            args, kwargs = builder.arguments(entry)
+        except KeyError:    # ссылка на другой мобжект - строим только в сцене
+            continue
+        yield entry["type"], args, kwargs
@@ -0,0 +1,125 @@
+from manim import *
+import numpy as np
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import manim
+
+try:
+    import fcntl
+except ImportError:  # Windows: без блокировки, параллельные рендеры могут терять записи индекса
+    fcntl = None
+
+# --- ХРАНИЛИЩЕ КОНТУРОВ ГЛИФОВ ---
+# Text сначала пишет SVG (pango), потом SVGMobject разбирает его в точки -
+# и так на каждом рендере. Здесь разобранные точки каждого глифа лежат в
+# одном бинарном файле (glyphs.bin, float64 подряд), который читается через
+# memmap, а index.json хранит для ключа список глифов: смещение, число точек
+# и стиль. При попадании Text собирается из готовых массивов без разбора SVG.
+#
+# Ключ - не отдельный символ, а вся строка с настройками (шрифт, начертание,
+# размер, цвет - то же, из чего manim строит имя SVG): положение глифов
+# зависит от кернинга и лигатур pango, а не только от самого символа.
+STORE_VERSION = 1
+
+class GlyphStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.data_path = self.root / "glyphs.bin"
+        self.index_path = self.root / "index.json"
+        self.lock_path = self.root / "lock"
+        self.index = {}
+        self.index_mtime = None
+        self.data = None
+        self.hits = 0
+        self.misses = 0
+
+    def _reload_index(self):
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self.index_mtime:
+            self.index = json.loads(self.index_path.read_text())
+            self.index_mtime = mtime
+
+    def _points(self):
+        size = self.data_path.stat().st_size // 8 if self.data_path.exists() else 0
+        if self.data is None or len(self.data) < size:
+            self.data = np.memmap(self.data_path, dtype=np.float64, mode="r") if size else np.zeros(0)
+        return self.data
+
+    def get(self, key):
+        self._reload_index()
+        entry = self.index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        data = self._points()
+        mobs = []
+        for offset, count, fill, stroke, stroke_width in entry:
+            mob = VMobject()
+            if count:
+                mob.points = np.array(data[offset:offset + 3 * count]).reshape(count, 3)
+            mob.fill_rgbas = np.array(fill, dtype=float).reshape(-1, 4)
+            mob.stroke_rgbas = np.array(stroke, dtype=float).reshape(-1, 4)
+            mob.stroke_width = stroke_width
+            mobs.append(mob)
+        self.hits += 1
+        return mobs
+
+    def put(self, key, mobs):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._reload_index()
+            if key in self.index:
+                return
+            with open(self.data_path, "ab") as data:
+                offset = data.tell() // 8
+                entry = []
+                for mob in mobs:
+                    points = np.asarray(mob.points, dtype=np.float64).reshape(-1, 3)
+                    data.write(points.tobytes())
+                    entry.append([
+                        offset, len(points),
+                        mob.fill_rgbas.ravel().tolist(),
+                        mob.stroke_rgbas.ravel().tolist(),
+                        float(mob.stroke_width),
+                    ])
+                    offset += points.size
+            self.index[key] = entry
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.index))
+            os.replace(tmp, self.index_path)
+            self.index_mtime = self.index_path.stat().st_mtime_ns
+
+_stores = {}
+
+def glyph_store():
+    root = Path(config.media_dir) / "glyphs"
+    if root not in _stores:
+        _stores[root] = GlyphStore(root)
+    return _stores[root]
+
+# --- TEXT ИЗ КЭША ---
+# Подмена только шага разбора SVG (init_svg_mobject): все остальное -
+# закрытие контуров, t2c, масштаб под font_size - делает обычный Text.
+class GlyphText(Text):
+    def _glyph_key(self):
+        seed = (STORE_VERSION, manim.__version__, Path(self.file_name).name, self.svg_default, self.path_string_config)
+        return hashlib.sha256(repr(seed).encode()).hexdigest()[:24]
+
+    def init_svg_mobject(self, use_svg_cache):
+        store = glyph_store()
+        key = self._glyph_key()
+        glyphs = store.get(key)
+        if glyphs is not None:
+            self.add(*glyphs)
+            return
+        super().init_svg_mobject(use_svg_cache)
+        store.put(key, self.submobjects)
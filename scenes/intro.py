@@ -1,4 +1,9 @@
 from manim import *
+import numpy as np
+
+from glyph_cache import GlyphText
+from robot_arm import MoveJoints, RobotArm
+from strokes import IncrementalWrite
 
 class DiplomaIntro(Scene):
     def construct(self):
@@ -46,13 +51,13 @@ class DiplomaIntro(Scene):
         manipulator.move_to(ORIGIN)
 
         # --- Intro text ---
-        title = Text("Robotic Manipulator", font_size=42, color=WHITE)
-        subtitle = Text("Visual Animation Concept", font_size=26, color=GREY_A)
+        title = GlyphText("Robotic Manipulator", font_size=42, color=WHITE)
+        subtitle = GlyphText("Visual Animation Concept", font_size=26, color=GREY_A)
         subtitle.next_to(title, DOWN)
 
         # --- Animation sequence ---
         self.play(FadeIn(title, shift=UP), run_time=1.2)
-        self.play(Write(subtitle), run_time=1)
+        self.play(IncrementalWrite(subtitle), run_time=1)
         self.wait(0.5)
         self.play(FadeOut(title), FadeOut(subtitle))
         self.wait(0.5)
@@ -66,17 +71,22 @@ class DiplomaIntro(Scene):
         self.play(Create(arm2), FadeIn(joint2), run_time=1)
         self.wait(0.5)
 
+        # --- Arm: links rotate about joints, joints follow the links ---
+        # The parts are on screen by now; the arm takes their place in the
+        # scene so each one is drawn once, links under joints as before
+        arm = RobotArm(
+            [joint1.get_center(), joint2.get_center(), arm2.get_right()],
+            links=[[arm1], [arm2]],
+            joints=[[joint1], [joint2], []],
+        )
+        self.remove(arm1, arm2, joint1, joint2)
+        self.add(arm)
+
+        # arm2 ends up turned by -PI/6 overall, as before, but stays attached to arm1
+        start_angles = arm.get_state()[0]
+        delta = np.array([PI / 8, -PI / 6 - PI / 8])
         self.play(
-            Rotate(
-                arm1,
-                angle=PI / 8,
-                about_point=joint1.get_center()
-            ),
-            Rotate(
-                arm2,
-                angle=-PI / 6,
-                about_point=joint2.get_center()
-            ),
+            MoveJoints(arm, angles=start_angles + delta),
             run_time=2,
             rate_func=smooth
         )
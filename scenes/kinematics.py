@@ -0,0 +1,142 @@
+from manim import *
+import numpy as np
+
+from baking import BakedFrames
+
+# --- 1. ВЕКТОРНАЯ ОБРАТНАЯ КИНЕМАТИКА ---
+# Двухзвенная IK сразу для всей траектории: (N, 3) целей -> (N, 3) локтей.
+def solve_two_link_ik(targets, origin, len1, len2, min_dist=0.1, reach_margin=0.01):
+    targets = np.atleast_2d(np.asarray(targets, dtype=float))
+    origin = np.asarray(origin, dtype=float)
+
+    vec = targets - origin
+    dist = np.linalg.norm(vec, axis=1)
+
+    # Недостижимые цели прижимаем к границе рабочей зоны
+    max_len = len1 + len2 - reach_margin
+    too_far = dist > max_len
+    vec[too_far] *= (max_len / dist[too_far])[:, None]
+    dist = np.clip(dist, min_dist, max_len)
+
+    angle_base = np.arctan2(vec[:, 1], vec[:, 0])
+    cos_angle_a = (len1**2 + dist**2 - len2**2) / (2 * len1 * dist)
+    angle1 = angle_base + np.arccos(np.clip(cos_angle_a, -1.0, 1.0))
+
+    elbows = np.zeros_like(targets)
+    elbows[:, 0] = origin[0] + np.cos(angle1) * len1
+    elbows[:, 1] = origin[1] + np.sin(angle1) * len1
+    elbows[:, 2] = origin[2]
+    ends = origin + vec
+    return elbows, ends
+
+# Моменты кадров внутри анимации (как их выдает Scene.play) + финальный кадр
+def frame_alphas(run_time, frame_rate=None):
+    frame_rate = frame_rate or config.frame_rate
+    return np.append(np.arange(0, run_time, 1 / frame_rate) / run_time, 1.0)
+
+# --- 2. ПРЕДРАСЧИТАННАЯ ТРАЕКТОРИЯ ---
+class IKTrack:
+    def __init__(self, alphas, targets, origin, len1, len2):
+        self.alphas = np.asarray(alphas, dtype=float)
+        self.targets = np.asarray(targets, dtype=float)
+        self.elbows, self.ends = solve_two_link_ik(self.targets, origin, len1, len2)
+        self.index = 0
+
+    # point_at(proportion) -> точка; rate_func "запекается" в выборку
+    @classmethod
+    def sample(cls, point_at, run_time, origin, len1, len2, rate_func=linear):
+        alphas = frame_alphas(run_time)
+        targets = np.array([point_at(rate_func(a)) for a in alphas])
+        return cls(alphas, targets, origin, len1, len2)
+
+    def seek(self, alpha):
+        index = np.searchsorted(self.alphas, alpha - 1e-9)
+        self.index = min(int(index), len(self.alphas) - 1)
+        return self.index
+
+    def row(self):
+        return self.targets[self.index], self.elbows[self.index]
+
+# --- 3. ИСТОЧНИК ПОЗЫ ДЛЯ АПДЕЙТЕРА ---
+# Пока играет FollowTrack, апдейтер только читает строку трека.
+# Вне трека (FadeIn, финальные движения) решаем IK для одной точки.
+# Режим "bake": rig(targets, elbows) -> каналы BakedFrames (lines/movers/arms),
+# тогда FollowTrack сам ставит готовую позу и апдейтеры не нужны.
+class IKDriver:
+    # center(mob) - чтение центра цели, например память кадра сцены (ledger.center)
+    def __init__(self, target, origin, len1, len2, rig=None, center=None):
+        self.target = target
+        self.center = center or Mobject.get_center
+        self.origin = np.asarray(origin, dtype=float)
+        self.len1 = len1
+        self.len2 = len2
+        self.rig = rig
+        self.track = None
+
+    def pose(self):
+        if self.track is not None:
+            return self.track.row()
+        target = self.center(self.target)
+        elbows, _ = solve_two_link_ik(target, self.origin, self.len1, self.len2)
+        return target, elbows[0]
+
+    def bake(self, track):
+        if self.rig is None:
+            return None
+        return BakedFrames(**self.rig(track.targets, track.elbows))
+
+    # Поставить позу для текущей цели сразу (в bake-режиме нет апдейтера)
+    def snap(self):
+        target = self.target.get_center()
+        frames = self.bake(IKTrack([1.0], [target], self.origin, self.len1, self.len2))
+        if frames is not None:
+            frames.apply(0)
+
+    def follow(self, point_at, run_time, rate_func=linear):
+        track = IKTrack.sample(point_at, run_time, self.origin, self.len1, self.len2, rate_func)
+        return FollowTrack(self, track, run_time=run_time)
+
+    def move_to(self, point, run_time, rate_func=smooth):
+        start = self.target.get_center()
+        return self.follow(lambda p: interpolate(start, point, p), run_time, rate_func)
+
+    # Держать руку в текущей позе, пока сцену двигают другие анимации
+    def hold(self, run_time):
+        start = self.target.get_center()
+        return self.follow(lambda p: start, run_time)
+
+# Пустой апдейтер-метка: Cairo-рендерер считает движущимися только мобжекты
+# анимаций и мобжекты с апдейтерами, остальное запекает в статичный слой play
+def _baked_motion(mob):
+    pass
+
+class FollowTrack(Animation):
+    # rate_func уже учтен при выборке трека, поэтому здесь всегда linear
+    def __init__(self, driver, track, **kwargs):
+        self.driver = driver
+        self.track = track
+        self.frames = driver.bake(track)
+        kwargs["rate_func"] = linear
+        super().__init__(driver.target, **kwargs)
+
+    # Запеченные руки/лучи двигаются без апдейтеров - помечаем их на время play,
+    # иначе они попадут в статичный слой и застынут
+    def begin(self):
+        if self.frames is not None:
+            for mob in self.frames.mobjects():
+                mob.add_updater(_baked_motion)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.driver.track = self.track
+        self.track.seek(alpha)
+        self.mobject.move_to(self.track.targets[self.track.index])
+        if self.frames is not None:
+            self.frames.apply(self.track.index)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        self.driver.track = None
+        if self.frames is not None:
+            for mob in self.frames.mobjects():
+                mob.remove_updater(_baked_motion)
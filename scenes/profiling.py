@@ -0,0 +1,208 @@
+from manim import *
+
+import json
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from time import perf_counter
+
+# --- ПРОФИЛИРОВЩИК РЕНДЕРА ---
+# Вешается на экземпляр сцены до render(): оборачивает методы сцены,
+# рендерера и file writer и раскладывает время каждого play/wait по стадиям:
+#   updaters    - Scene.update_mobjects (апдейтеры, в т.ч. IK)
+#   interpolate - Scene.update_to_time без апдейтеров (interpolate анимаций)
+#   raster      - renderer.update_frame (Cairo, включая статичный слой)
+#   encode      - file writer (запись кадров, закрытие и склейка фрагментов)
+# Остаток времени play (хэширование, begin/clean_up) идет в self time.
+# Стадии считаются эксклюзивно: время вложенной стадии не входит во внешнюю.
+STAGES = ("updaters", "interpolate", "raster", "encode")
+
+class Span:
+    __slots__ = ("name", "cat", "start", "end", "children", "stages")
+
+    def __init__(self, name, cat, start):
+        self.name = name
+        self.cat = cat
+        self.start = start
+        self.end = None
+        self.children = []
+        self.stages = dict.fromkeys(STAGES, 0.0)
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def self_time(self):
+        return self.duration - sum(c.duration for c in self.children) - sum(self.stages.values())
+
+def _animation_name(anim):
+    name = type(anim).__name__
+    return "animate" if name == "_AnimationBuilder" else name
+
+class RenderProfiler:
+    def __init__(self, scene):
+        self.scene = scene
+        self.root = Span(type(scene).__name__, "scene", perf_counter())
+        self.stack = [self.root]
+        self.plays = 0
+        self.frames = 0
+        self._nested = 0.0
+        scene.profiler = self
+        self._instrument()
+
+    def _instrument(self):
+        scene = self.scene
+        renderer = scene.renderer
+        writer = renderer.file_writer
+        scene.update_to_time = self._stage("interpolate", scene.update_to_time)
+        scene.update_mobjects = self._stage("updaters", scene.update_mobjects)
+        renderer.update_frame = self._stage("raster", renderer.update_frame)
+        add_frame = renderer.add_frame
+
+        # Замороженные кадры (wait без апдейтеров) приходят одним вызовом с num_frames
+        def counted_add_frame(frame, num_frames=1):
+            if not renderer.skip_animations:
+                self.frames += num_frames
+            return add_frame(frame, num_frames)
+
+        renderer.add_frame = counted_add_frame
+        for method in ("write_frame", "begin_animation", "end_animation", "finish"):
+            if hasattr(writer, method):
+                setattr(writer, method, self._stage("encode", getattr(writer, method)))
+
+        play = scene.play
+
+        def timed_play(*args, **kwargs):
+            names = ", ".join(_animation_name(a) for a in args)
+            kind = "wait" if names == "Wait" else "play"
+            with self.span(f"{kind} {self.plays}" if kind == "wait" else f"play {self.plays}: {names}", kind):
+                self.plays += 1
+                return play(*args, **kwargs)
+
+        scene.play = timed_play
+
+    def _stage(self, stage, fn):
+        def wrapped(*args, **kwargs):
+            start = perf_counter()
+            outer, self._nested = self._nested, 0.0
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                total = perf_counter() - start
+                self.stack[-1].stages[stage] += total - self._nested
+                self._nested = outer + total
+        return wrapped
+
+    @contextmanager
+    def span(self, name, cat="span"):
+        span = Span(name, cat, perf_counter())
+        self.stack[-1].children.append(span)
+        self.stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = perf_counter()
+            self.stack.pop()
+
+    def finish(self):
+        self.root.end = perf_counter()
+        return self
+
+    # --- ОТЧЕТЫ ---
+    def stage_totals(self):
+        totals = dict.fromkeys(STAGES + ("other",), 0.0)
+
+        def walk(span):
+            for stage, value in span.stages.items():
+                totals[stage] += value
+            totals["other"] += span.self_time()
+            for child in span.children:
+                walk(child)
+
+        walk(self.root)
+        return totals
+
+    def plays_table(self):
+        rows = []
+
+        def walk(span, path):
+            if span.cat in ("play", "wait"):
+                rows.append({"name": span.name, "path": path, "seconds": span.duration, **span.stages})
+            for child in span.children:
+                walk(child, path + [child.name])
+
+        walk(self.root, [])
+        return rows
+
+    # Chrome trace (chrome://tracing, Perfetto, speedscope). Стадии внутри
+    # play - суммарные, поэтому рисуются подряд в конце своего спана.
+    def trace_events(self):
+        events = []
+        t0 = self.root.start
+
+        def us(seconds):
+            return round(seconds * 1e6, 1)
+
+        def walk(span):
+            events.append({"name": span.name, "cat": span.cat, "ph": "X", "pid": 1, "tid": 1,
+                           "ts": us(span.start - t0), "dur": us(span.duration)})
+            cursor = span.end - sum(span.stages.values())
+            for stage, value in span.stages.items():
+                if value > 0:
+                    events.append({"name": stage, "cat": "stage", "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": us(cursor - t0), "dur": us(value)})
+                    cursor += value
+            for child in span.children:
+                walk(child)
+
+        walk(self.root)
+        return events
+
+    # Свернутые стеки для flamegraph.pl / inferno (микросекунды)
+    def folded(self):
+        lines = []
+
+        def walk(span, path):
+            stack = path + [span.name.replace(";", ",")]
+            own = int(span.self_time() * 1e6)
+            if own > 0:
+                lines.append(f"{';'.join(stack)} {own}")
+            for stage, value in span.stages.items():
+                if value > 0:
+                    lines.append(f"{';'.join(stack + [stage])} {int(value * 1e6)}")
+            for child in span.children:
+                walk(child, stack)
+
+        walk(self.root, [])
+        return "\n".join(lines) + "\n"
+
+    def write(self, out_dir=None):
+        out_dir = Path(out_dir or Path(config.media_dir) / "profiles")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        name = type(self.scene).__name__
+        report = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "summary": {
+                "scene": name,
+                "seconds": self.root.duration,
+                "frames": self.frames,
+                "stages": self.stage_totals(),
+                "plays": self.plays_table(),
+            },
+        }
+        ledger = getattr(self.scene, "ledger", None)
+        if ledger is not None:
+            report["summary"]["updaters"] = ledger.table()
+            report["summary"]["frame_memo"] = {"hits": ledger.memo_hits, "misses": ledger.memo_misses}
+        renderer = self.scene.renderer
+        if hasattr(renderer, "reused_frames"):
+            report["summary"]["reused_frames"] = renderer.reused_frames
+        json_path = out_dir / f"{name}.json"
+        json_path.write_text(json.dumps(report, indent=1))
+        (out_dir / f"{name}.folded").write_text(self.folded())
+        return json_path
+
+# Именованный спан, если у сцены есть профилировщик; иначе ничего не делает
+def profile_span(scene, name):
+    profiler = getattr(scene, "profiler", None)
+    return profiler.span(name) if profiler is not None else nullcontext()
@@ -0,0 +1,250 @@
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+import numpy as np
+
+import hashlib
+
+from updaters import UpdaterLedger
+
+# --- 1. КЭШ СТАТИЧНОГО СЛОЯ ---
+# Cairo-рендерер manim уже рисует неподвижные мобжекты (без апдейтеров, не в
+# анимации и стоящие раньше первого движущегося) один раз на play в
+# статичную картинку и кладет ее под движущиеся. Но делает это в каждом play
+# заново, хотя сетка NumberPlane между play обычно не меняется.
+# Здесь статичный слой живет между play: ключ - набор статичных мобжектов,
+# их точки и стиль плюс камера. Пока ключ тот же, растеризации нет вовсе;
+# сдвинули или перекрасили сетку (world.animate.scale(...)) - слой пересобран.
+def _camera_state(camera):
+    return repr((
+        camera.background_color, camera.background_opacity,
+        tuple(np.round(camera.frame_center, 9)), camera.frame_width, camera.frame_height,
+    )).encode()
+
+# Все, что влияет на то, как мобжект нарисует Cairo
+def _update_mobject_digest(digest, mob):
+    digest.update(id(mob).to_bytes(8, "little", signed=False))
+    digest.update(np.ascontiguousarray(mob.points).tobytes())
+    if isinstance(mob, VMobject):
+        for array in (mob.fill_rgbas, mob.stroke_rgbas, mob.background_stroke_rgbas):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(repr((
+            mob.stroke_width, mob.background_stroke_width, mob.z_index,
+            mob.sheen_factor, tuple(np.asarray(mob.sheen_direction).tolist()),
+            getattr(mob, "joint_type", None), getattr(mob, "cap_style", None),
+        )).encode())
+    elif hasattr(mob, "pixel_array"):
+        digest.update(np.ascontiguousarray(mob.pixel_array).tobytes())
+
+def _static_layer_key(camera, mobjects):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_camera_state(camera))
+    for mob in mobjects:
+        _update_mobject_digest(digest, mob)
+    return digest.digest()
+
+def _mobject_fingerprint(mob):
+    digest = hashlib.blake2b(digest_size=16)
+    _update_mobject_digest(digest, mob)
+    return digest.digest()
+
+# --- 2. ГРЯЗНЫЕ ОБЛАСТИ ---
+# Внутри play кадр = статичный слой + движущиеся мобжекты. Из движущихся
+# реально меняются единицы (рука, луч, искра), остальные (буквы после первой
+# анимации в z-порядке) стоят. Для изменившихся берем рамки в прошлом и в
+# текущем кадре, восстанавливаем в них статичный слой и перерисовываем все
+# движущиеся с клипом Cairo по этим рамкам. Вне рамок пиксели прошлого кадра
+# уже верные. Рамки выровнены по пикселям, поэтому результат совпадает с
+# полной перерисовкой.
+# Запас под толщину линии: stroke_width * 0.01 единиц, с учетом острых стыков
+MITER_PAD = 5
+# Если грязно больше этой доли кадра - проще перерисовать кадр целиком
+FULL_REDRAW_FRACTION = 0.6
+
+def _mobject_bbox(mob, line_width_multiple):
+    points = mob.points
+    if len(points) == 0:
+        return None
+    lo = points[:, :2].min(axis=0)
+    hi = points[:, :2].max(axis=0)
+    width = 0.0
+    if isinstance(mob, VMobject):
+        width = max(mob.get_stroke_width(), mob.get_stroke_width(background=True))
+    pad = MITER_PAD * width * line_width_multiple
+    return np.array([lo[0] - pad, lo[1] - pad, hi[0] + pad, hi[1] + pad])
+
+# --- 3. ПОВТОР НЕИЗМЕННЫХ КАДРОВ ---
+# Те же отпечатки движущихся мобжектов - это и хэш состояния кадра: если
+# камера, статичный слой, состав движущихся и все их отпечатки совпали с
+# прошлым кадром, кадр не растеризуется и не копируется - в кодировщик
+# уходит тот же массив. Повторяется только кадр, который этот рендерер
+# действительно нарисовал. Так wait с висящими апдейтерами (рука с лазером, лишь бы кто-то
+# был "движущимся") стоит один хэш на кадр. При попадании в кэш статичного
+# слоя прошлый кадр переживает и границу play - цепочка коротких wait между
+# актами тоже не рисуется.
+class StaticLayerRenderer(CairoRenderer):
+    def __init__(self, *args, dirty_regions=False, reuse_frames=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.static_key = None
+        self.static_cache = None
+        self.static_hits = 0
+        self.static_misses = 0
+        self.dirty_regions = dirty_regions
+        self.previous = None        # id(mob) -> (отпечаток, рамка) прошлого кадра
+        self.previous_camera = None
+        self._rendering = False
+        self.partial_frames = 0
+        self.full_frames = 0
+        self.reuse_frames = reuse_frames
+        self.last_frame = None
+        self.reused_frames = 0
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        if not static_mobjects:
+            # Новый play: фон мог смениться, первый кадр рисуем целиком
+            self.previous = None
+            self.static_image = None
+            return None
+        key = _static_layer_key(self.camera, static_mobjects)
+        if key == self.static_key:
+            # Фон тот же и буфер камеры никто не трогал - прошлый кадр еще верен
+            self.static_hits += 1
+            self.static_image = self.static_cache
+            return self.static_image
+        self.previous = None
+        self.static_misses += 1
+        # get_frame() отдает копию буфера камеры, так что кэш не портится
+        self.static_cache = super().save_static_frame_data(scene, static_mobjects)
+        self.static_key = key
+        return self.static_cache
+
+    def render(self, scene, time, moving_mobjects):
+        if not (self.dirty_regions or self.reuse_frames):
+            return super().render(scene, time, moving_mobjects)
+
+        multiple = self.camera.cairo_line_width_multiple
+        current = {id(mob): (_mobject_fingerprint(mob), mob) for mob in moving_mobjects}
+        camera = _camera_state(self.camera)
+        if self.reuse_frames and self._unchanged(current, camera):
+            self.reused_frames += 1
+            self.add_frame(self.last_frame)
+            return
+
+        rects = self._dirty_rects(current, multiple) if self.dirty_regions else None
+        if rects is None:
+            self.full_frames += 1
+        else:
+            self.partial_frames += 1
+
+        self._rendering = True
+        try:
+            self.update_frame(scene, moving_mobjects, dirty_rects=rects)
+        finally:
+            self._rendering = False
+        self.previous = {key: (fp, _mobject_bbox(mob, multiple)) for key, (fp, mob) in current.items()}
+        self.previous_camera = camera
+        self.last_frame = self.get_frame()
+        self.add_frame(self.last_frame)
+
+    def _unchanged(self, current, camera):
+        previous = self.previous
+        if previous is None or self.last_frame is None or self.previous_camera != camera:
+            return False
+        if list(current) != list(previous):
+            return False
+        return all(previous[key][0] == fp for key, (fp, _) in current.items())
+
+    def update_frame(self, scene, mobjects=None, *args, dirty_rects=None, **kwargs):
+        if dirty_rects is not None:
+            if dirty_rects:
+                self._redraw_rects(dirty_rects, mobjects)
+            return
+        # Кадр рисует кто-то кроме render - прошлому кадру больше не доверяем
+        if not self._rendering:
+            self.previous = None
+            self.last_frame = None
+        super().update_frame(scene, mobjects, *args, **kwargs)
+
+    # Пиксельные прямоугольники (x0, y0, x1, y1) для перерисовки или None - весь кадр
+    def _dirty_rects(self, current, multiple):
+        camera = self.camera
+        if self.previous is None or self.previous_camera != _camera_state(camera):
+            return None
+        # Поменялся состав или z-порядок движущихся - перекрытия уже другие
+        if list(current) != list(self.previous):
+            return None
+        # Картинки и облака точек рисуются мимо Cairo и клипа не слушают
+        if any(not isinstance(mob, VMobject) for _, mob in current.values()):
+            return None
+        boxes = []
+        for key, (fp, mob) in current.items():
+            old = self.previous.get(key)
+            if old is not None and old[0] == fp:
+                continue
+            boxes.append(_mobject_bbox(mob, multiple))
+            if old is not None:
+                boxes.append(old[1])
+
+        pw, ph = camera.pixel_width, camera.pixel_height
+        sx, sy = pw / camera.frame_width, ph / camera.frame_height
+        cx, cy = camera.frame_center[:2]
+        rects = []
+        for box in boxes:
+            if box is None:
+                continue
+            # +1 пиксель под сглаживание краев
+            x0 = int(np.floor((box[0] - cx) * sx + pw / 2)) - 1
+            x1 = int(np.ceil((box[2] - cx) * sx + pw / 2)) + 1
+            y0 = int(np.floor(ph / 2 - (box[3] - cy) * sy)) - 1
+            y1 = int(np.ceil(ph / 2 - (box[1] - cy) * sy)) + 1
+            x0, x1 = max(x0, 0), min(x1, pw)
+            y0, y1 = max(y0, 0), min(y1, ph)
+            if x1 > x0 and y1 > y0:
+                rects.append((x0, y0, x1, y1))
+
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        if area > FULL_REDRAW_FRACTION * pw * ph:
+            return None
+        return rects
+
+    def _redraw_rects(self, rects, moving_mobjects):
+        camera = self.camera
+        pixels = camera.pixel_array
+        background = self.static_image if self.static_image is not None else camera.background
+        for x0, y0, x1, y1 in rects:
+            pixels[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+
+        # Клип в координатах сцены (матрица контекста камеры), по тем же пикселям
+        ctx = camera.get_cairo_context(pixels)
+        pw, ph = camera.pixel_width, camera.pixel_height
+        sx, sy = pw / camera.frame_width, ph / camera.frame_height
+        cx, cy = camera.frame_center[:2]
+        ctx.new_path()
+        for x0, y0, x1, y1 in rects:
+            left, right = cx + (x0 - pw / 2) / sx, cx + (x1 - pw / 2) / sx
+            top, bottom = cy + (ph / 2 - y0) / sy, cy + (ph / 2 - y1) / sy
+            ctx.rectangle(left, bottom, right - left, top - bottom)
+        ctx.clip()
+        try:
+            camera.capture_mobjects(moving_mobjects, include_submobjects=True)
+        finally:
+            ctx.reset_clip()
+
+# Базовая сцена с кэшем статичного слоя (для OpenGL - обычная Scene).
+# dirty_regions - перерисовывать внутри play только изменившиеся области,
+# reuse_frames - не рисовать кадр, совпадающий с прошлым.
+# Апдейтеры идут через UpdaterLedger: учет времени и self.ledger.center(mob)
+class LayeredScene(Scene):
+    dirty_regions = True
+    reuse_frames = True
+
+    def __init__(self, renderer=None, camera_class=Camera, skip_animations=False, **kwargs):
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            renderer = StaticLayerRenderer(
+                camera_class=camera_class, skip_animations=skip_animations,
+                dirty_regions=self.dirty_regions, reuse_frames=self.reuse_frames,
+            )
+        self.ledger = UpdaterLedger()
+        super().__init__(renderer=renderer, camera_class=camera_class, skip_animations=skip_animations, **kwargs)
+
+    def update_mobjects(self, dt):
+        self.ledger.update(self.mobjects, dt)
@@ -0,0 +1,195 @@
+from manim import *
+import numpy as np
+
+# --- 1. КИНЕМАТИКА ЦЕПОЧКИ (ПАЧКОЙ) ---
+# Позиции суставов (..., n+1, 3) -> относительные углы и длины звеньев (..., n).
+# Работает и для одной позы, и для всей траектории сразу.
+def chain_state(points):
+    points = np.asarray(points, dtype=float)
+    steps = np.diff(points, axis=-2)
+    lengths = np.linalg.norm(steps[..., :2], axis=-1)
+    abs_angles = np.arctan2(steps[..., 1], steps[..., 0])
+    angles = np.diff(abs_angles, axis=-1, prepend=0.0)
+    return angles, lengths
+
+# Прямая кинематика: углы и длины (..., n) -> позиции суставов (..., n+1, 3)
+def forward_kinematics(origin, angles, lengths, base_angle=0.0, base_scale=1.0):
+    angles = np.asarray(angles, dtype=float)
+    abs_angles = base_angle + np.cumsum(angles, axis=-1)
+    steps = np.zeros(angles.shape + (3,))
+    steps[..., 0] = np.cos(abs_angles) * lengths * base_scale
+    steps[..., 1] = np.sin(abs_angles) * lengths * base_scale
+    joints = np.zeros(angles.shape[:-1] + (angles.shape[-1] + 1, 3))
+    joints[..., 1:, :] = np.cumsum(steps, axis=-2)
+    return joints + np.asarray(origin, dtype=float)[..., None, :]
+
+# --- 2. СОСТОЯНИЕ РУКИ ---
+# state: (2, n) - строка 0 углы суставов, строка 1 длины звеньев.
+# local/frame/slices: все точки всех деталей в локальных системах звеньев,
+# чтобы поза пересчитывалась одним векторным проходом.
+class ArmSpec:
+    __slots__ = ("n_links", "state", "ref_angle", "ref_length", "local", "frame", "slices", "world")
+
+# --- 3. РУКА-МАНИПУЛЯТОР ---
+# points - позиции суставов в исходной позе; links[i] - детали звена i,
+# joints[j] - детали сустава j (последний - инструмент). Детали передаются
+# уже расставленными по исходной позе; звенья поворачиваются и тянутся
+# вдоль своей оси, детали суставов только переносятся.
+class RobotArm(VGroup):
+    def __init__(self, points, links, joints=None, **kwargs):
+        super().__init__(**kwargs)
+        points = np.asarray(points, dtype=float)
+        n = len(points) - 1
+        if joints is None:
+            joints = [[] for _ in range(n + 1)]
+
+        self.links = [VGroup(*body) for body in links]
+        self.joints = [VGroup(*decor) for decor in joints]
+        # Опорные точки базы: если руку двигают/вращают/масштабируют целиком
+        # (в том числе через родительский VGroup), они едут вместе с ней
+        self.anchors = VGroup(VectorizedPoint(points[0]), VectorizedPoint(points[1]))
+        self.add(*self.links, *self.joints, self.anchors)
+
+        angles, lengths = chain_state(points)
+        ref = points[1] - points[0]
+        spec = ArmSpec()
+        spec.n_links = n
+        spec.state = np.vstack([angles, lengths])
+        spec.ref_angle = np.arctan2(ref[1], ref[0])
+        spec.ref_length = np.linalg.norm(ref[:2])
+        self.spec = spec
+        self._capture_templates(points, angles, lengths)
+
+    @property
+    def tool(self):
+        return self.joints[-1]
+
+    def _capture_templates(self, points, angles, lengths):
+        spec = self.spec
+        abs_angles = np.cumsum(angles)
+        local, frame, slices = [], [], []
+        cursor = 0
+
+        def take(mob, rel, frame_index):
+            nonlocal cursor
+            local.append(rel)
+            frame.append(np.full(len(rel), frame_index))
+            slices.append((mob, cursor, cursor + len(rel)))
+            cursor += len(rel)
+
+        for i, body in enumerate(self.links):
+            c, s = np.cos(abs_angles[i]), np.sin(abs_angles[i])
+            for mob in body.family_members_with_points():
+                rel = mob.points - points[i]
+                # Ось x вдоль звена в долях его длины
+                take(mob, np.column_stack([
+                    (c * rel[:, 0] + s * rel[:, 1]) / lengths[i],
+                    -s * rel[:, 0] + c * rel[:, 1],
+                    rel[:, 2],
+                ]), i)
+        for j, decor in enumerate(self.joints):
+            for mob in decor.family_members_with_points():
+                take(mob, mob.points - points[j], spec.n_links + j)
+
+        spec.local = np.concatenate(local) if local else np.zeros((0, 3))
+        spec.frame = np.concatenate(frame).astype(int) if frame else np.zeros(0, dtype=int)
+        spec.slices = slices
+        spec.world = np.zeros_like(spec.local)
+
+    # Текущая рамка базы: начало, поворот и масштаб относительно исходной
+    def _base_frame(self):
+        p0 = self.anchors[0].points[0]
+        ref = self.anchors[1].points[0] - p0
+        rot = np.arctan2(ref[1], ref[0]) - self.spec.ref_angle
+        scale = np.linalg.norm(ref[:2]) / self.spec.ref_length
+        return p0, rot, scale
+
+    def get_state(self):
+        return self.spec.state.copy()
+
+    def get_joint_positions(self):
+        origin, rot, scale = self._base_frame()
+        return forward_kinematics(origin, self.spec.state[0], self.spec.state[1], rot, scale)
+
+    def set_state(self, angles=None, lengths=None):
+        if angles is not None:
+            self.spec.state[0] = angles
+        if lengths is not None:
+            self.spec.state[1] = lengths
+        self._update_geometry()
+        return self
+
+    # Поза в мировых координатах (как ее выдает chain_state) -> state в рамке базы
+    def state_for(self, angles, lengths):
+        _, rot, scale = self._base_frame()
+        state = np.vstack([angles, np.asarray(lengths, dtype=float) / scale])
+        state[0, 0] -= rot
+        return state
+
+    def set_world_pose(self, origin, angles, lengths):
+        p0, rot, scale = self._base_frame()
+        shift = np.asarray(origin, dtype=float) - p0
+        if np.any(shift):
+            for anchor in self.anchors:
+                anchor.points = anchor.points + shift
+        self.spec.state[:] = self.state_for(angles, lengths)
+        self._update_geometry()
+        return self
+
+    def set_joint_positions(self, points):
+        points = np.asarray(points, dtype=float)
+        angles, lengths = chain_state(points)
+        return self.set_world_pose(points[0], angles, lengths)
+
+    def _update_geometry(self):
+        spec = self.spec
+        n = spec.n_links
+        origin, rot, scale = self._base_frame()
+        joints = forward_kinematics(origin, spec.state[0], spec.state[1], rot, scale)
+        abs_angles = rot + np.cumsum(spec.state[0])
+
+        # Рамки: сначала n звеньев (поворот + растяжение), затем n+1 суставов (перенос)
+        cos = np.concatenate([np.cos(abs_angles), np.full(n + 1, np.cos(rot))])
+        sin = np.concatenate([np.sin(abs_angles), np.full(n + 1, np.sin(rot))])
+        stretch = np.concatenate([spec.state[1], np.ones(n + 1)])
+        offset = np.concatenate([joints[:-1], joints])
+
+        f = spec.frame
+        x = spec.local[:, 0] * stretch[f]
+        y = spec.local[:, 1]
+        world = spec.world
+        world[:, 0] = scale * (cos[f] * x - sin[f] * y) + offset[f, 0]
+        world[:, 1] = scale * (sin[f] * x + cos[f] * y) + offset[f, 1]
+        world[:, 2] = scale * spec.local[:, 2] + offset[f, 2]
+
+        # Детали смотрят в общий буфер, копий точек на кадр нет
+        for mob, a, b in spec.slices:
+            mob.points = world[a:b]
+
+# --- 4. ДВИЖЕНИЕ В ПРОСТРАНСТВЕ СУСТАВОВ ---
+# Интерполируем углы (по кратчайшей дуге) и длины, а не тысячи точек Безье:
+# на кадр - один вызов set_state. Цель - углы/длины или позиции суставов.
+class MoveJoints(Animation):
+    def __init__(self, arm, angles=None, lengths=None, points=None, **kwargs):
+        self.target_angles = angles
+        self.target_lengths = lengths
+        self.target_points = points
+        super().__init__(arm, **kwargs)
+
+    def begin(self):
+        arm = self.mobject
+        self.start_state = arm.get_state()
+        end_state = self.start_state.copy()
+        if self.target_points is not None:
+            end_state = arm.state_for(*chain_state(self.target_points))
+        if self.target_angles is not None:
+            end_state[0] = self.target_angles
+        if self.target_lengths is not None:
+            end_state[1] = self.target_lengths
+        self.delta = end_state - self.start_state
+        self.delta[0] = (self.delta[0] + PI) % TAU - PI
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        state = self.start_state + self.rate_func(alpha) * self.delta
+        self.mobject.set_state(state[0], state[1])
@@ -1,5 +1,7 @@
 from manim import*
 
+from glyph_cache import GlyphText
+
 class BaseScene(Scene):
     def construct(self):
         square = Square()
@@ -50,8 +52,8 @@ class RotationTest(Scene):
 
 class TestDesignerScene(Scene):
     def construct(self):
-        title = Text("Robotic MAnipulator")
-        subtitle = Text("Visual consept animation")
+        title = GlyphText("Robotic MAnipulator")
+        subtitle = GlyphText("Visual consept animation")
 
         subtitle.next_to(title, DOWN)
 
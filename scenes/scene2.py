@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from kinematics import IKDriver
+from render_layers import LayeredScene
+from robot_arm import RobotArm
+from updaters import depends_on
+
 # --- 1. ПАЛИТРА ---
 PALETTE = {
     "background": "#1A1A1A",
@@ -12,18 +17,24 @@ PALETTE = {
     "connection_line": "#FFF59D"
 }
 
+LINK1_LEN = 2.0
+LINK2_LEN = 1.5
+
 # --- 2. ФУНКЦИЯ СОЗДАНИЯ РОБОТА ---
 # Эта функция проста и надежна, мы ее оставляем.
 def create_robot_arm(accent_color, link_color, scale=1.0):
-    link1 = Line(ORIGIN, UP * 2.0, color=link_color, stroke_width=4)
-    link2 = Line(link1.get_end(), link1.get_end() + UP * 1.5, color=link_color, stroke_width=4)
-    dot = Dot(color=accent_color, radius=0.12)
-    arm = VGroup(link1, link2, dot).scale(scale)
-    return arm
+    points = [ORIGIN, UP * LINK1_LEN * scale, UP * (LINK1_LEN + LINK2_LEN) * scale]
+    link1 = Line(points[0], points[1], color=link_color, stroke_width=4)
+    link2 = Line(points[1], points[2], color=link_color, stroke_width=4)
+    dot = Dot(points[2], color=accent_color, radius=0.12 * scale)
+    return RobotArm(points, links=[[link1], [link2]], joints=[[], [], [dot]])
 
 # --- 3. ОСНОВНАЯ СЦЕНА ---
 # Используется НАДЕЖНЫЙ метод "привязки к цели". Класс RobotDance ПОЛНОСТЬЮ УДАЛЕН.
-class ZenGardenScene(Scene):
+class ZenGardenScene(LayeredScene):
+    # True - позы руки запекаются заранее, False - классический апдейтер
+    bake = True
+
     def construct(self):
         # -- SCENE SETUP --
         self.camera.background_color = PALETTE["background"]
@@ -43,52 +54,54 @@ class ZenGardenScene(Scene):
         self.add(world)
 
         # -- СОЗДАЕМ НЕВИДИМУЮ ЦЕЛЬ И "ПРИВЯЗКУ" --
-        target_dot = Dot(main_robot[2].get_center(), radius=0)
+        # Цель стартует под базой, как в исходной версии (там схват стоял в
+        # начале группы, а группу центрировали в main_robot_origin): в первом
+        # акте рука смотрит вниз
+        target_dot = Dot(main_robot_origin + DOWN * (LINK1_LEN + LINK2_LEN) / 2, radius=0)
 
-        def arm_updater(robot):
-            target_pos = target_dot.get_center()
-            link1, link2, end_effector_dot = robot
-            
-            # Важно: база робота теперь зафиксирована
-            origin = main_robot_origin
-            max_reach = 3.5
-            
-            vec = target_pos - origin
-            dist = np.linalg.norm(vec)
-            if dist == 0: # Защита от деления на ноль и нулевых векторов
-                return 
-            if dist > max_reach:
-                vec *= max_reach / dist
+        def arm_rig(targets, elbows):
+            origins = np.broadcast_to(ik.origin, targets.shape)
+            return {"arms": [(main_robot, np.stack([origins, elbows, targets], axis=1))]}
 
-            joint1_pos = origin + vec * (2.0 / max_reach)
-            link1.put_start_and_end_on(origin, joint1_pos)
-            link2.put_start_and_end_on(joint1_pos, target_pos)
-            end_effector_dot.move_to(target_pos)
+        # Важно: база робота теперь зафиксирована
+        ik = IKDriver(
+            target_dot, main_robot_origin, LINK1_LEN, LINK2_LEN,
+            rig=arm_rig if self.bake else None, center=self.ledger.center,
+        )
+
+        @depends_on(target_dot)
+        def arm_updater(robot):
+            target_pos, joint1_pos = ik.pose()
+            # Второе звено, как и раньше, дотягивается до цели даже вне досягаемости
+            robot.set_joint_positions([ik.origin, joint1_pos, target_pos])
 
-        main_robot.add_updater(arm_updater)
+        # В bake-режиме позы запекаются в FollowTrack; пока двигается весь мир,
+        # руку держит ik.hold (он идет последним и перекрывает трансформацию world)
+        if not self.bake:
+            main_robot.add_updater(arm_updater)
         
         # -- АНИМАЦИЯ: МЫ ДВИГАЕМ ТОЛЬКО ЦЕЛЬ `target_dot` --
 
         # АКТЫ 1-3
-        self.play(world.animate.scale(1.2).move_to(zen_objects.get_center() * -0.5), run_time=2)
+        self.play(world.animate.scale(1.2).move_to(zen_objects.get_center() * -0.5), ik.hold(run_time=2), run_time=2)
         self.wait(1)
         
         self.play(
-            target_dot.animate.move_to(ORIGIN),
             world.animate.move_to(ORIGIN),
+            ik.move_to(ORIGIN, run_time=4),
             run_time=4, rate_func=smooth
         )
         self.wait(1)
 
-        self.play(target_dot.animate.move_to(sphere1.get_center()), run_time=2)
+        self.play(ik.move_to(sphere1.get_center(), run_time=2))
         self.play(Wiggle(sphere1), sphere1.animate.set_color(PALETTE["zen_sphere_on"]))
         self.wait(0.5)
         
-        self.play(target_dot.animate.move_to(sphere2.get_center()), run_time=3)
+        self.play(ik.move_to(sphere2.get_center(), run_time=3))
         self.play(Wiggle(sphere2), sphere2.animate.set_color(PALETTE["zen_sphere_on"]))
         self.wait(0.5)
         
-        self.play(target_dot.animate.move_to(sphere3.get_center()), run_time=2)
+        self.play(ik.move_to(sphere3.get_center(), run_time=2))
         self.play(Wiggle(sphere3), sphere3.animate.set_color(PALETTE["zen_sphere_on"]))
         self.wait(1)
         
@@ -0,0 +1,337 @@
+from manim import *
+import numpy as np
+
+# --- 1. ГЕОМЕТРИЯ КОНТУРОВ ---
+# Кубические кривые VMobject: 4 опорные точки на кривую
+BERNSTEIN_DEGREE = 3
+
+def bezier_samples(vmob, samples_per_curve=16):
+    points = vmob.get_points()
+    n = BERNSTEIN_DEGREE + 1
+    curves = points[: len(points) // n * n].reshape(-1, n, 3)
+    t = np.linspace(0, 1, samples_per_curve)[:, None]
+    coeffs = np.hstack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t**2, t**3])
+    # (кривые, сэмплы, 3)
+    return np.einsum("sk,ckd->csd", coeffs, curves)
+
+def path_length(vmob, samples_per_curve=16):
+    total = 0.0
+    for sub in vmob.family_members_with_points():
+        samples = bezier_samples(sub, samples_per_curve)
+        total += np.linalg.norm(np.diff(samples, axis=1), axis=2).sum()
+    return total
+
+def glyph_parts(text_group):
+    # Manim хранит части буквы в submobjects. Если их нет, значит буква цельная.
+    for letter in text_group:
+        parts = letter.submobjects if len(letter.submobjects) > 0 else [letter]
+        yield letter, parts
+
+def part_start(part):
+    if hasattr(part, "get_start"):
+        return part.get_start()
+    # Если вдруг метод не сработает, берем центр (как запасной вариант)
+    return part.get_center()
+
+# --- 2. ДЛИНА ДУГИ И ПОСТЕПЕННОЕ ПРОЯВЛЕНИЕ ---
+# Таблица строится один раз на контур: накопленная длина по кривым и внутри
+# каждой кривой по сэмплам. Доля длины -> (кривая, t) за O(log n).
+# point_from_proportion manim на каждый вызов заново меряет все кривые
+# контура; кривые он взвешивает по длине, но внутри кривой идет по t, а не
+# по длине. Здесь доля - доля длины и внутри кривой, скорость постоянна.
+class ArcLengthTable:
+    def __init__(self, vmob, samples_per_curve=16):
+        n = BERNSTEIN_DEGREE + 1
+        points = vmob.get_points()
+        self.curves = np.array(points[: len(points) // n * n]).reshape(-1, n, 3)
+        samples = bezier_samples(vmob, samples_per_curve)
+        steps = np.linalg.norm(np.diff(samples, axis=1), axis=2)
+        self.n_curves = len(samples)
+        self.ts = np.linspace(0, 1, samples_per_curve)
+        # (кривые, сэмплы): длина от начала кривой до сэмпла
+        self.within = np.hstack([np.zeros((self.n_curves, 1)), np.cumsum(steps, axis=1)])
+        self.cum = np.concatenate([[0.0], np.cumsum(self.within[:, -1])])
+        self.length = self.cum[-1]
+
+    def locate(self, alpha):
+        if self.n_curves == 0:
+            return 0, 0.0
+        alpha = min(max(alpha, 0.0), 1.0)
+        if self.length <= 0:
+            # Вырожденный контур: делим поровну по кривым
+            k, t = divmod(alpha * self.n_curves, 1.0)
+        else:
+            s = alpha * self.length
+            k = np.searchsorted(self.cum, s, side="right") - 1
+            k = min(int(k), self.n_curves - 1)
+            t = np.interp(s - self.cum[k], self.within[k], self.ts)
+        if k >= self.n_curves:
+            return self.n_curves - 1, 1.0
+        return int(k), float(t)
+
+    # Точка на доле длины alpha
+    def point_at(self, alpha):
+        if self.n_curves == 0:
+            return np.zeros(3)
+        k, t = self.locate(alpha)
+        a, b, c, d = self.curves[k]
+        u = 1 - t
+        return u**3 * a + 3 * u**2 * t * b + 3 * u * t**2 * c + t**3 * d
+
+# Первая часть кубической кривой до t (де Кастельжо) прямо в out
+def _split_cubic(curve, t, out):
+    a = curve[0] + t * (curve[1] - curve[0])
+    b = curve[1] + t * (curve[2] - curve[1])
+    c = curve[2] + t * (curve[3] - curve[2])
+    d = a + t * (b - a)
+    e = b + t * (c - b)
+    out[0] = curve[0]
+    out[1] = a
+    out[2] = d
+    out[3] = d + t * (e - d)
+
+# Проявление контура от начала до доли длины alpha. Вместо
+# pointwise_become_partial (новые массивы под весь контур на каждом кадре)
+# mob.points - вид на заранее выделенный буфер: на кадр дописываются только
+# кривые, ставшие целыми, и пересчитывается одна частичная.
+class PathReveal:
+    def __init__(self, mob, path, table=None):
+        n = BERNSTEIN_DEGREE + 1
+        self.mob = mob
+        self.source = np.array(path.points[: len(path.points) // n * n])
+        self.buffer = np.empty_like(self.source)
+        self.table = table or ArcLengthTable(path)
+        self.filled = 0     # сколько кривых в буфере совпадают с исходными
+
+    def set_progress(self, alpha):
+        if len(self.source) == 0:
+            return
+        n = BERNSTEIN_DEGREE + 1
+        k, t = self.table.locate(alpha)
+        if k > self.filled:
+            self.buffer[n * self.filled:n * k] = self.source[n * self.filled:n * k]
+        self.filled = k
+        _split_cubic(self.source[n * k:n * k + n], t, self.buffer[n * k:n * k + n])
+        self.mob.points = self.buffer[:n * (k + 1)]
+
+# Create и Write с тем же проявлением по длине дуги
+class IncrementalCreate(Create):
+    def begin(self):
+        self.reveals = {}
+        super().begin()
+
+    def interpolate_submobject(self, submobject, starting_submobject, alpha):
+        reveal = self.reveals.get(id(submobject))
+        if reveal is None:
+            reveal = self.reveals[id(submobject)] = PathReveal(submobject, starting_submobject)
+        reveal.set_progress(self._get_bounds(alpha)[1])
+
+class IncrementalWrite(Write):
+    def begin(self):
+        self.reveals = {}
+        super().begin()
+
+    # Как DrawBorderThenFill: первая половина - контур, вторая - заливка
+    def interpolate_submobject(self, submobject, starting_submobject, outline, alpha):
+        index, subalpha = integer_interpolate(0, 2, alpha)
+        if index == 0:
+            reveal = self.reveals.get(id(submobject))
+            if reveal is None:
+                reveal = self.reveals[id(submobject)] = PathReveal(submobject, outline)
+            reveal.set_progress(subalpha)
+            submobject.match_style(outline)
+        else:
+            submobject.interpolate(outline, starting_submobject, subalpha)
+
+# --- 3. ПОРЯДОК ОБХОДА (TSP) ---
+# Штрих k входит в точку entries[k] и выходит в exits[k]; развернутый штрих
+# меняет их местами. Ищем порядок и направления с минимальным холостым ходом:
+# жадный ближайший сосед, затем 2-opt (разворот участка = смена направлений).
+def order_strokes(starts, ends, start_point, max_passes=200):
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    n = len(starts)
+    pos = np.asarray(start_point, dtype=float)
+
+    # 1. Ближайший сосед
+    order, flipped = [], []
+    left = np.ones(n, dtype=bool)
+    for _ in range(n):
+        d_fwd = np.where(left, np.linalg.norm(starts - pos, axis=1), np.inf)
+        d_rev = np.where(left, np.linalg.norm(ends - pos, axis=1), np.inf)
+        k_fwd, k_rev = int(np.argmin(d_fwd)), int(np.argmin(d_rev))
+        if d_rev[k_rev] < d_fwd[k_fwd]:
+            k, rev = k_rev, True
+        else:
+            k, rev = k_fwd, False
+        order.append(k)
+        flipped.append(rev)
+        left[k] = False
+        pos = starts[k] if rev else ends[k]
+
+    order = np.array(order, dtype=int)
+    flipped = np.array(flipped, dtype=bool)
+
+    # 2. 2-opt для открытого маршрута
+    for _ in range(max_passes):
+        entries = np.where(flipped[:, None], ends[order], starts[order])
+        exits = np.where(flipped[:, None], starts[order], ends[order])
+        improved = False
+        for i in range(n):
+            prev_exit = exits[i - 1] if i > 0 else np.asarray(start_point, dtype=float)
+            for j in range(i + 1, n):
+                # После разворота [i..j] вход в участок = старый выход j, выход = старый вход i
+                delta = np.linalg.norm(exits[j] - prev_exit) - np.linalg.norm(entries[i] - prev_exit)
+                if j + 1 < n:
+                    delta += np.linalg.norm(entries[j + 1] - entries[i]) - np.linalg.norm(entries[j + 1] - exits[j])
+                if delta < -1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    flipped[i:j + 1] = ~flipped[i:j + 1][::-1]
+                    improved = True
+                    break
+            if improved:
+                break
+        if not improved:
+            break
+
+    return list(zip(order.tolist(), flipped.tolist()))
+
+# --- 4. ПЛАН ШТРИХОВ ---
+class StrokeSegment:
+    def __init__(self, kind, t0, duration, start, end, part=None, path=None):
+        self.kind = kind          # "travel" или "draw"
+        self.t0 = t0
+        self.duration = duration
+        self.t1 = t0 + duration
+        self.start = start
+        self.end = end
+        self.part = part          # живая часть буквы, которую проявляем
+        self.path = path          # полная копия контура (эталон для частичной кривой)
+        # Одна таблица длины дуги на контур: для цели IK и для проявления
+        self.table = ArcLengthTable(path) if path is not None else None
+
+    def point_at(self, local):
+        if self.kind == "travel":
+            return interpolate(self.start, self.end, smooth(local))
+        return self.table.point_at(local)
+
+class StrokePlan:
+    # Один проход по буквам: перелеты и прожиги с таймингами.
+    # Длительность прожига пропорциональна длине контура, а не числу частей.
+    # order="text" - как в тексте, order="shortest" - минимум холостого хода.
+    def __init__(
+        self, text_group, start_point,
+        draw_speed=8.0, travel_speed=10.0,
+        min_draw_time=0.2, min_travel_time=0.15, cool_time=0.2,
+        order="text",
+    ):
+        self.text_group = text_group
+        self.segments = []
+        self.cooling = []   # (letter, t0, t1)
+
+        strokes = [(letter, part) for letter, parts in glyph_parts(text_group) for part in parts]
+        starts = [part_start(part) for _, part in strokes]
+        ends = [part.get_end() if hasattr(part, "get_end") else start for (_, part), start in zip(strokes, starts)]
+        if order == "shortest" and strokes:
+            sequence = order_strokes(starts, ends, start_point)
+        elif order == "text":
+            sequence = [(k, False) for k in range(len(strokes))]
+        else:
+            raise ValueError(f"Unknown stroke order: {order!r}")
+
+        t = 0.0
+        pos = np.asarray(start_point, dtype=float)
+        letter_done = {}
+        for k, rev in sequence:
+            letter, part = strokes[k]
+            start, end = (ends[k], starts[k]) if rev else (starts[k], ends[k])
+
+            travel = max(min_travel_time, np.linalg.norm(start - pos) / travel_speed)
+            self.segments.append(StrokeSegment("travel", t, travel, pos, start))
+            t += travel
+
+            path = part.copy()
+            if rev:
+                path.reverse_points()
+            draw = max(min_draw_time, path_length(part) / draw_speed)
+            self.segments.append(StrokeSegment("draw", t, draw, start, end, part, path))
+            t += draw
+            pos = end
+            letter_done[id(letter)] = (letter, t)
+
+        # Буква остывает, когда прожжены все ее части; остывание идет
+        # параллельно с перелетом к следующему штриху
+        for letter, t_done in sorted(letter_done.values(), key=lambda item: item[1]):
+            self.cooling.append((letter, t_done, t_done + cool_time))
+
+        self.duration = max(t, self.cooling[-1][2]) if self.cooling else t
+        self.starts = np.array([seg.t0 for seg in self.segments])
+        self.draws = [seg for seg in self.segments if seg.kind == "draw"]
+
+    def segment_at(self, t):
+        index = np.searchsorted(self.starts, t, side="right") - 1
+        return self.segments[int(np.clip(index, 0, len(self.segments) - 1))]
+
+    # Точка цели в доле alpha всего плана (для IKDriver.follow)
+    def point_at(self, alpha):
+        t = alpha * self.duration
+        seg = self.segment_at(t)
+        local = np.clip((t - seg.t0) / seg.duration, 0, 1)
+        return seg.point_at(local)
+
+# --- 5. ВСЁ СЛОВО ОДНОЙ АНИМАЦИЕЙ ---
+# Вместо пяти self.play на каждую часть буквы: перелеты, лазер, прожиг и
+# остывание идут по одной временной шкале внутри одного play.
+class WriteStrokePlan(Animation):
+    def __init__(self, plan, beam, spark, burn_color, cool_color, stroke_width=4, **kwargs):
+        self.plan = plan
+        self.beam = beam
+        self.spark = spark
+        self.burn_color = burn_color
+        self.cool_color = cool_color
+        self.stroke_width = stroke_width
+        kwargs.setdefault("run_time", plan.duration)
+        kwargs["rate_func"] = linear
+        super().__init__(plan.text_group, **kwargs)
+
+    def begin(self):
+        self.draw_cursor = 0
+        self.cool_cursor = 0
+        self.laser_on = None
+        self.reveals = [PathReveal(seg.part, seg.path, seg.table) for seg in self.plan.draws]
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = alpha * self.plan.duration
+
+        # Прожиг: трогаем только начатые и еще не законченные части
+        draws = self.plan.draws
+        for seg, reveal in zip(draws[self.draw_cursor:], self.reveals[self.draw_cursor:]):
+            if seg.t0 > t:
+                break
+            progress = min((t - seg.t0) / seg.duration, 1.0)
+            seg.part.set_stroke(color=self.burn_color, width=self.stroke_width)
+            reveal.set_progress(progress)
+            if progress >= 1.0:
+                self.draw_cursor += 1
+
+        # Остывание букв
+        for letter, t0, t1 in self.plan.cooling[self.cool_cursor:]:
+            if t0 > t:
+                break
+            a = min((t - t0) / (t1 - t0), 1.0) if t1 > t0 else 1.0
+            letter.set_stroke(
+                color=interpolate_color(self.burn_color, self.cool_color, a),
+                width=self.stroke_width * (1 - a),
+            )
+            letter.set_fill(color=WHITE, opacity=a)
+            if a >= 1.0:
+                self.cool_cursor += 1
+
+        # Лазер горит только во время прожига
+        seg = self.plan.segment_at(t)
+        laser_on = seg.kind == "draw" and t < seg.t1
+        if laser_on != self.laser_on:
+            self.laser_on = laser_on
+            self.beam.set_stroke(width=self.stroke_width if laser_on else 0, opacity=1 if laser_on else 0)
+            self.spark.set_opacity(1 if laser_on else 0)
@@ -0,0 +1,215 @@
+from manim import *
+import numpy as np
+
+import functools
+import hashlib
+import heapq
+import inspect
+from time import perf_counter
+
+# --- 1. УЧЕТ АПДЕЙТЕРОВ И ПАМЯТЬ КАДРА ---
+# Тот же обход, что у Scene.update_mobjects -> Mobject.update, но:
+#  - время и число вызовов каждого апдейтера (по имени функции);
+#  - "принимает ли dt" проверяется один раз на функцию, а не
+#    inspect.signature на каждый вызов каждого кадра;
+#  - память кадра: center(mob) считает рамку мобжекта один раз за кадр,
+#    остальные апдейтеры получают готовое значение. Апдейтер мобжекта M
+#    сбрасывает запомненное для всего, что пересекается с семейством M,
+#    поэтому после robot_updater голова руки читается уже новой.
+def updater_name(fn):
+    fn = inspect.unwrap(fn)
+    name = getattr(fn, "__name__", type(fn).__name__)
+    code = getattr(fn, "__code__", None)
+    if name == "<lambda>" and code is not None:
+        return f"<lambda>:{code.co_firstlineno}"
+    return name
+
+# --- 2. ОБЪЯВЛЕННЫЕ ЗАВИСИМОСТИ ---
+# @depends_on(target_dot) над апдейтером: что он читает; пишет он по
+# умолчанию свой мобжект (writes= - если еще что-то). Для объявленных
+# апдейтеров порядок больше не зависит от порядка self.add: писатель идет
+# раньше читателя (топологическая сортировка, при равенстве - исходный
+# порядок). Необъявленный апдейтер считается читающим все и пишущим свой
+# мобжект: объявленные писатели уходят раньше него.
+# Объявленный апдейтер без dt пропускается, если его входы (читаемые и
+# записываемые мобжекты: точки и стиль) не изменились с прошлого запуска -
+# на wait и затуханиях неподвижная рука не стоит ничего, кроме хэша.
+# Апдейтеры с dt зависят от времени и запускаются всегда.
+# Объявление живет на обертке, а не на самой функции: связанному методу
+# атрибут не присвоить, а общая функция с разными объявлениями затирала бы
+# их друг другу. Сигнатуру (есть ли dt) inspect берет через __wrapped__.
+def depends_on(*reads, writes=None):
+    def mark(fn):
+        @functools.wraps(fn)
+        def declared(*args, **kwargs):
+            return fn(*args, **kwargs)
+        declared.reads = reads
+        declared.writes = writes
+        return declared
+    return mark
+
+def _declared(fn):
+    return hasattr(fn, "reads")
+
+def _family_ids(mobjects):
+    return frozenset(id(m) for mob in mobjects for m in mob.get_family())
+
+def _writes(mob, fn):
+    return fn.writes if getattr(fn, "writes", None) is not None else (mob,)
+
+# None - "что угодно" (чтения необъявленного апдейтера)
+def _overlap(reads, writes):
+    return reads is None or not reads.isdisjoint(writes)
+
+def state_digest(mobjects):
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in mobjects:
+        for m in mob.get_family():
+            digest.update(np.ascontiguousarray(m.points).tobytes())
+            if isinstance(m, VMobject):
+                digest.update(np.ascontiguousarray(m.fill_rgbas).tobytes())
+                digest.update(np.ascontiguousarray(m.stroke_rgbas).tobytes())
+                digest.update(np.float64(m.stroke_width).tobytes())
+    return digest.digest()
+
+# jobs: [(mob, fn)] в порядке обхода manim -> тот же список в порядке запуска
+def schedule(jobs):
+    n = len(jobs)
+    reads = [_family_ids(fn.reads) if _declared(fn) else None for _, fn in jobs]
+    writes = [_family_ids(_writes(mob, fn)) for mob, fn in jobs]
+    before = [set() for _ in range(n)]     # before[j] - кто обязан идти раньше j
+    for i in range(n):
+        for j in range(i + 1, n):
+            if _overlap(reads[j], writes[i]) or not writes[i].isdisjoint(writes[j]):
+                before[j].add(i)
+            elif _overlap(reads[i], writes[j]):
+                before[i].add(j)
+
+    order, done = [], set()
+    ready = [j for j in range(n) if not before[j]]
+    heapq.heapify(ready)
+    while len(order) < n:
+        if not ready:
+            # Цикл в объявлениях: берем самый ранний по исходному порядку
+            stuck = min(j for j in range(n) if j not in done)
+            logger.warning(f"Updater dependency cycle at {updater_name(jobs[stuck][1])}, keeping add() order")
+            ready = [stuck]
+        j = heapq.heappop(ready)
+        if j in done:
+            continue
+        done.add(j)
+        order.append(jobs[j])
+        for k in range(n):
+            if k not in done and j in before[k]:
+                before[k].discard(j)
+                if not before[k]:
+                    heapq.heappush(ready, k)
+    return order
+
+class UpdaterLedger:
+    def __init__(self):
+        self.costs = {}         # имя -> [вызовы, секунды]
+        self.skips = {}         # имя -> пропуски (входы не менялись)
+        self.frames = 0
+        self.memo = {}          # (id мобжекта, ключ) -> (значение, id семейства)
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._takes_dt = {}
+        self._order_key = None
+        self._order = []
+        self._inputs = {}       # (id мобжекта, id апдейтера) -> хэш входов после запуска
+
+    def begin_frame(self):
+        self.frames += 1
+        self.memo.clear()
+
+    def update(self, mobjects, dt):
+        self.begin_frame()
+        jobs = []
+        for mob in mobjects:
+            self._collect(mob, jobs)
+        if not any(_declared(fn) for _, fn in jobs):
+            for mob, fn in jobs:
+                self.run(fn, mob, dt)
+            return
+        key = tuple((id(mob), id(fn)) for mob, fn in jobs)
+        if key != self._order_key:
+            self._order_key = key
+            self._order = schedule(jobs)
+        for mob, fn in self._order:
+            if _declared(fn):
+                self.run_declared(fn, mob, dt)
+            else:
+                self.run(fn, mob, dt)
+
+    def _collect(self, mob, jobs):
+        if mob.updating_suspended:
+            return
+        for fn in mob.updaters:
+            jobs.append((mob, fn))
+        for sub in mob.submobjects:
+            self._collect(sub, jobs)
+
+    def takes_dt(self, fn):
+        takes_dt = self._takes_dt.get(fn)
+        if takes_dt is None:
+            takes_dt = self._takes_dt[fn] = "dt" in inspect.signature(fn).parameters
+        return takes_dt
+
+    def run(self, fn, mob, dt):
+        start = perf_counter()
+        if self.takes_dt(fn):
+            fn(mob, dt)
+        else:
+            fn(mob)
+        cost = self.costs.setdefault(updater_name(fn), [0, 0.0])
+        cost[0] += 1
+        cost[1] += perf_counter() - start
+        if self.memo:
+            self.invalidate(mob)
+
+    def run_declared(self, fn, mob, dt):
+        if self.takes_dt(fn):
+            self.run(fn, mob, dt)
+            return
+        watched = tuple(fn.reads) + tuple(_writes(mob, fn))
+        key = (id(mob), id(fn))
+        if self._inputs.get(key) == state_digest(watched):
+            name = updater_name(fn)
+            self.skips[name] = self.skips.get(name, 0) + 1
+            return
+        self.run(fn, mob, dt)
+        self._inputs[key] = state_digest(watched)
+
+    def invalidate(self, mob):
+        touched = {id(m) for m in mob.get_family()}
+        self.memo = {key: entry for key, entry in self.memo.items() if touched.isdisjoint(entry[1])}
+
+    def cached(self, mob, key, compute):
+        entry = self.memo.get((id(mob), key))
+        if entry is not None:
+            self.memo_hits += 1
+            return entry[0]
+        self.memo_misses += 1
+        value = compute(mob)
+        self.memo[(id(mob), key)] = (value, frozenset(id(m) for m in mob.get_family()))
+        return value
+
+    # Копия: вызывающий может сдвигать результат, не портя память кадра
+    def center(self, mob):
+        return self.cached(mob, "center", Mobject.get_center).copy()
+
+    def table(self):
+        frames = self.frames or 1
+        rows = [
+            {
+                "updater": name, "calls": calls, "skipped": self.skips.get(name, 0),
+                "seconds": seconds, "ms_per_frame": seconds / frames * 1e3,
+            }
+            for name, (calls, seconds) in self.costs.items()
+        ]
+        rows += [
+            {"updater": name, "calls": 0, "skipped": skipped, "seconds": 0.0, "ms_per_frame": 0.0}
+            for name, skipped in self.skips.items() if name not in self.costs
+        ]
+        return sorted(rows, key=lambda row: -row["seconds"])